@@ -0,0 +1,28 @@
+"""Add runner pool claim index.
+
+Revision ID: 3f9a1c2d7b84
+Revises: c35b665904af
+Create Date: 2026-10-17 09:12:41.503118
+
+"""
+from typing import Union
+from collections.abc import Sequence
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f9a1c2d7b84'
+down_revision: Union[str, None] = 'c35b665904af'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_runner_image_id_state_created_on', 'runner', ['image_id', 'state', 'created_on'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_runner_image_id_state_created_on', table_name='runner')
@@ -0,0 +1,28 @@
+"""Add runner state index.
+
+Revision ID: 5b8e0c3a9d12
+Revises: 7d2e4b9a1f60
+Create Date: 2026-10-17 11:14:52.301447
+
+"""
+from typing import Union
+from collections.abc import Sequence
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b8e0c3a9d12'
+down_revision: Union[str, None] = '7d2e4b9a1f60'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_runner_state_user_id', 'runner', ['state', 'user_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_runner_state_user_id', table_name='runner')
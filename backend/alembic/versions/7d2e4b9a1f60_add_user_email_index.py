@@ -0,0 +1,28 @@
+"""Add user email index.
+
+Revision ID: 7d2e4b9a1f60
+Revises: 3f9a1c2d7b84
+Create Date: 2026-10-17 10:02:17.884215
+
+"""
+from typing import Union
+from collections.abc import Sequence
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7d2e4b9a1f60'
+down_revision: Union[str, None] = '3f9a1c2d7b84'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(op.f('ix_user_email'), 'user', ['email'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_user_email'), table_name='user')
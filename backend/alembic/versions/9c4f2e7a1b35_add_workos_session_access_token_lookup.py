@@ -0,0 +1,71 @@
+"""Add workos session access token lookup column.
+
+Revision ID: 9c4f2e7a1b35
+Revises: 5b8e0c3a9d12
+Create Date: 2026-10-17 12:41:06.518230
+
+"""
+import os
+import base64
+import hashlib
+from typing import Union
+from collections.abc import Sequence
+
+from alembic import op
+import sqlalchemy as sa
+from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+from cryptography.hazmat.primitives import padding
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c4f2e7a1b35'
+down_revision: Union[str, None] = '5b8e0c3a9d12'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# The app encrypts with AES-128, keyed by the first 16 bytes of ENCRYPTION_KEY
+AES_KEY_LENGTH = 16
+
+def _access_token_digest(key_bytes: bytes, encrypted_access_token: str) -> str:
+    """Decrypt an access token stored by the app (AES-128 CBC, IV prefixed) and return its SHA-256 hex digest."""
+    encrypted_bytes = base64.urlsafe_b64decode(encrypted_access_token)
+    decryptor = Cipher(algorithms.AES(key_bytes), modes.CBC(encrypted_bytes[:16])).decryptor()
+    padded_plaintext = decryptor.update(encrypted_bytes[16:]) + decryptor.finalize()
+    unpadder = padding.PKCS7(128).unpadder()
+    access_token = unpadder.update(padded_plaintext) + unpadder.finalize()
+    return hashlib.sha256(access_token).hexdigest()
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('workos_session', sa.Column('access_token_lookup', sa.String(length=64), nullable=True))
+
+    # Backfill the digest of every stored access token from its ciphertext. Sessions without an
+    # access token keep NULL, so they do not collide in the unique index.
+    workos_session = sa.table('workos_session',
+                              sa.column('session_id', sa.String),
+                              sa.column('access_token', sa.Text),
+                              sa.column('access_token_lookup', sa.String))
+    connection = op.get_bind()
+    rows = connection.execute(sa.select(workos_session.c.session_id, workos_session.c.access_token)
+                              .where(workos_session.c.access_token != '')).all()
+    if rows:
+        encryption_key = os.getenv("ENCRYPTION_KEY")
+        if not encryption_key or len(encryption_key.encode("utf-8")) < AES_KEY_LENGTH:
+            raise ValueError("ENCRYPTION_KEY must be set to the app's key to backfill access_token_lookup.")
+        key_bytes = encryption_key.encode("utf-8")[:AES_KEY_LENGTH]
+        connection.execute(
+            workos_session.update()
+            .where(workos_session.c.session_id == sa.bindparam('b_session_id'))
+            .values(access_token_lookup=sa.bindparam('b_access_token_lookup')),
+            [{'b_session_id': session_id, 'b_access_token_lookup': _access_token_digest(key_bytes, access_token)}
+             for session_id, access_token in rows]
+        )
+
+    op.create_index(op.f('ix_workos_session_access_token_lookup'), 'workos_session', ['access_token_lookup'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_workos_session_access_token_lookup'), table_name='workos_session')
+    op.drop_column('workos_session', 'access_token_lookup')
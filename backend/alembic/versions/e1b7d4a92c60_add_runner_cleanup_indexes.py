@@ -0,0 +1,30 @@
+"""Add runner cleanup indexes.
+
+Revision ID: e1b7d4a92c60
+Revises: 9c4f2e7a1b35
+Create Date: 2026-10-17 14:08:33.142907
+
+"""
+from typing import Union
+from collections.abc import Sequence
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e1b7d4a92c60'
+down_revision: Union[str, None] = '9c4f2e7a1b35'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_runner_session_end_state', 'runner', ['session_end', 'state'], unique=False)
+    op.create_index('ix_runner_state_updated_on', 'runner', ['state', 'updated_on'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_runner_state_updated_on', table_name='runner')
+    op.drop_index('ix_runner_session_end_state', table_name='runner')
@@ -1,6 +1,9 @@
 """Main application file for the API."""
 import re
 import os
+import logging
+import traceback
+import orjson
 from http import HTTPStatus
 from fastapi import APIRouter
 from app.api.routes import user_auth, machine_auth, registration, users, endpoint_permissions
@@ -14,13 +17,16 @@ from app.util import constants
 from app.db.database import create_db_and_tables
 from app.business.resource_setup import fill_runner_pools, setup_resources, setup_endpoint_permissions
 # from app.business.runner_management import shutdown_all_runners
-from app.business.pkce import verify_token_exp
+from app.business.pkce import verify_token_exp, preload_signing_keys
 from app.exceptions.authentication_exceptions import NoMatchingKeyException
-from app.models.workos_session import get_refresh_token, refresh_session
+from app.models.workos_session import get_refresh_token_by_digest, refresh_session_by_digest
+from app.business.encryption import digest_text
 from workos import exceptions as workos_exceptions
 from app.exceptions.authentication_exceptions import NoRefreshSessionFound
 from typing import Optional
 
+logger = logging.getLogger(__name__)
+
 API_ROOT_PATH: str = '/api' #stripped out of request.url.path by the proxy
 API_VERSION: str = '/v1' #still present in the path, not for docs
 
@@ -48,12 +54,81 @@ DEV_ROUTES: tuple = (
     '/openapi.json/?$'
 )
 
-def path_in_route_patterns(path: str, patterns: tuple) -> bool:
-    """Check if our route matches a regex in our tuple of routes."""
+def compile_route_patterns(patterns: tuple) -> re.Pattern:
+    """Combine a tuple of route regexes into one compiled alternation."""
+    return re.compile('|'.join(f'(?:{pattern})' for pattern in patterns))
+
+def exact_route_paths(patterns: tuple) -> frozenset:
+    """
+    Collect the literal paths matched by fully anchored patterns without other regex syntax.
+
+    A trailing '/?$' is expanded to both the bare and the slashed path.
+    """
+    paths = set()
+    for pattern in patterns:
+        if pattern.endswith('/?$'):
+            literal = pattern[:-3]
+            if re.escape(literal) == literal:
+                paths.update((literal, f'{literal}/'))
+    return frozenset(paths)
+
+ROUTE_REGEX_METACHARACTERS: frozenset = frozenset('\\.^$*+?{}[]|()')
+
+def literal_route_prefixes(patterns: tuple) -> tuple:
+    """Collect the literal text each pattern starts with, up to its first regex metacharacter."""
+    prefixes = []
     for pattern in patterns:
-        if re.match(pattern, path):
+        end = next((i for i, char in enumerate(pattern) if char in ROUTE_REGEX_METACHARACTERS), len(pattern))
+        if end < len(pattern) and pattern[end] in '?*{':
+            # A quantifier makes the character before it optional, so it can't be part of the prefix
+            end = max(end - 1, 0)
+        prefixes.append(pattern[:end])
+    return tuple(prefixes)
+
+class RouteGroup:
+    """
+    A group of route regexes, prepared once at import for the route guard.
+
+    Literal routes are answered with a set lookup, and the compiled alternation only runs for
+    paths that start with one of the patterns' literal prefixes, so most secured requests never
+    touch the regex engine.
+    """
+
+    def __init__(self, patterns: tuple):
+        """Prepare the lookups for a tuple of route regexes."""
+        self.pattern: re.Pattern = compile_route_patterns(patterns)
+        self.exact_paths: frozenset = exact_route_paths(patterns)
+        self.prefixes: tuple = literal_route_prefixes(patterns)
+
+    def matches(self, path: str) -> bool:
+        """Check if the path belongs to this route group."""
+        if path in self.exact_paths:
             return True
-    return False
+        return path.startswith(self.prefixes) and self.pattern.match(path) is not None
+
+UNSECURE_ROUTE_GROUP: RouteGroup = RouteGroup(UNSECURE_ROUTES)
+RUNNER_ACCESS_ROUTE_GROUP: RouteGroup = RouteGroup(RUNNER_ACCESS_ROUTES)
+DEV_ROUTE_GROUP: RouteGroup = RouteGroup(DEV_ROUTES)
+
+def path_in_route_patterns(path: str, route_group: RouteGroup) -> bool:
+    """Check if our route matches a group of route regexes."""
+    return route_group.matches(path)
+
+RUNNER_ROUTE_PREFIX: str = f'{API_VERSION}/runners/'
+RUNNER_ROUTE_PREFIX_LENGTH: int = len(RUNNER_ROUTE_PREFIX)
+
+def runner_id_from_path(path: str) -> Optional[str]:
+    """Return the runner id segment of a runner route, or None if the path has none."""
+    if not path.startswith(RUNNER_ROUTE_PREFIX):
+        return None
+    runner_id = path[RUNNER_ROUTE_PREFIX_LENGTH:].split('/', 1)[0]
+    return runner_id if runner_id.isdigit() else None
+
+# Fixed JSON bodies for the route guard's rejections, encoded once instead of per rejected request
+MISSING_ACCESS_TOKEN_BODY: bytes = orjson.dumps({"detail": "Missing Access Token"})
+INVALID_WORKOS_SESSION_BODY: bytes = orjson.dumps({"detail": "Invalid workos session"})
+BAD_TOKEN_HEADER_BODY: bytes = orjson.dumps({"detail": "Bad Token Header"})
+SESSION_EXPIRED_BODY: bytes = orjson.dumps({"detail": "Session expired, unable to refresh."})
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -64,6 +139,7 @@ async def lifespan(app: FastAPI):
     # Set up default resources
     setup_resources()
     setup_endpoint_permissions()
+    preload_signing_keys()
 
     # Find all images with pool size > 0 and launch runners for each
     await fill_runner_pools()
@@ -106,15 +182,11 @@ def start_api():
 
         Before the response is sent, execution returns to the middleware, where we make sure the access_token is updated before responding.
         """
-        import logging
-        logger = logging.getLogger(__name__) #logs getting buried by ASGI, only exception logs are forced to stdout
-        print(f'Request Path: {request.url.path}')
+        path = request.url.path
+        logger.debug('Request Path: %s', path)
 
         # Use pattern matching for runner state endpoints
-        path = request.url.path
-        path_parts = path.split('/')
-        runner_path_prefix = f"{API_ROOT_PATH}{API_VERSION}/runners/"
-        print(f"Checking if path {path} starts with {runner_path_prefix}")
+        logger.debug("Checking if path %s starts with %s", path, RUNNER_ROUTE_PREFIX)
 
         workos = get_workos_client()
 
@@ -125,50 +197,51 @@ def start_api():
         """
         final_response: Response = None
 
-        access_token = request.headers.get("Access-Token")
-
-        #print route
-        print(f"\n\nRequest Path: {request.url.path}")
+        # Build Starlette's header mapping once and read every header from it
+        headers = request.headers
+        access_token = headers.get("Access-Token")
 
         if not access_token:
-            print('not access-token')
+            logger.debug('not access-token')
 
         try:
             # Check exact matches for bypassing middleware
-            if (path_in_route_patterns(path, UNSECURE_ROUTES) or
-                constants.auth_mode=="OFF") or (path_in_route_patterns(path, DEV_ROUTES) and
+            if (path_in_route_patterns(path, UNSECURE_ROUTE_GROUP) or
+                constants.auth_mode=="OFF") or (path_in_route_patterns(path, DEV_ROUTE_GROUP) and
                                                 constants.auth_mode!="PROD"):
-                    print('Unsecured route entered.')
+                    logger.debug('Unsecured route entered.')
                     final_response = await call_next(request)
 
             # Check for runner access paths
-            if (not final_response and path_in_route_patterns(request.url.path, RUNNER_ACCESS_ROUTES)):
-                print('Runner access route entered.')
+            if (not final_response and path_in_route_patterns(path, RUNNER_ACCESS_ROUTE_GROUP)):
+                logger.debug('Runner access route entered.')
                 if (access_token and access_token == constants.jwt_secret):
                     final_response = await call_next(request)
-                elif (request.headers.get("Runner-Token")):
-                    runner_id = re.search(r'/runners/(\d+)(?:/.*)?$', path).group(1) if re.search(r'/runners/(\d+)(?:/.*)?$', path) else None
-                    runner_token = request.headers.get("Runner-Token")
-                    if runner_management.auth_runner(runner_id, runner_token):
+                else:
+                    runner_token = headers.get("Runner-Token")
+                    if runner_token and runner_management.auth_runner(runner_id_from_path(path), runner_token):
                         final_response = await call_next(request)
 
             # If none of the above, we must find an access token
             if not final_response and not access_token:
-                print('no auth methods present, error 400...')
-                final_response = Response(status_code = 400, content = "Missing Access Token")
+                logger.debug('no auth methods present, error 400...')
+                final_response = Response(status_code = 400, content = MISSING_ACCESS_TOKEN_BODY, media_type = "application/json")
 
             # Verify expiration on access token, if expired try to refresh
             if (not final_response) and access_token:
-                print('access-token secured route entered.')
+                logger.debug('access-token secured route entered.')
                 if verify_token_exp(access_token):
                     # Continue with request
                     response: Response = await call_next(request)
                     response.headers['Access-Token'] = access_token
                     final_response = response
                 else:
-                    print('Failed to auth with token, refreshing...')
-                    refresh_response = workos.user_management.authenticate_with_refresh_token(refresh_token = get_refresh_token(access_token))
-                    refresh_session(access_token, refresh_response.access_token, refresh_response.refresh_token)
+                    logger.debug('Failed to auth with token, refreshing...')
+                    # Digest once, the token digest is the indexed key for both the lookup and the rotation
+                    token_key = digest_text(access_token)
+                    refresh_response = workos.user_management.authenticate_with_refresh_token(
+                        refresh_token = get_refresh_token_by_digest(token_key))
+                    refresh_session_by_digest(token_key, refresh_response.access_token, refresh_response.refresh_token)
                     access_token = refresh_response.access_token
                     response: Response = await call_next(request)
                     response.headers['Access-Token'] = access_token
@@ -178,24 +251,28 @@ def start_api():
             logger.exception(f'WorkOS raised BadRequestException in middleware.')
             final_response = Response(
                 status_code = HTTPStatus.BAD_REQUEST,
-                content = "Invalid workos session")
+                content = INVALID_WORKOS_SESSION_BODY,
+                media_type = "application/json")
         except NoMatchingKeyException as e:
             logger.exception(f'No PKCE key matched token header')
             final_response = Response(
                 status_code = HTTPStatus.BAD_REQUEST,
-                content = "Bad Token Header")
+                content = BAD_TOKEN_HEADER_BODY,
+                media_type = "application/json")
         except NoRefreshSessionFound as e:
             logger.exception(f'No PKCE key matched token header')
             final_response = Response(
                 status_code = HTTPStatus.UNAUTHORIZED,
-                content = "Session expired, unable to refresh.")
+                content = SESSION_EXPIRED_BODY,
+                media_type = "application/json")
         except Exception as e:
             logger.exception(f'Exception raised in the authentication middleware.')
             final_response = Response(
                 status_code = HTTPStatus.INTERNAL_SERVER_ERROR,
-                content = '{"response":"Internal Server Error: ' + str(e) + '"}'
+                content = orjson.dumps({"response": f"Internal Server Error: {e!s}"}),
+                media_type = "application/json"
             )
-        print('returning final response.')
+        logger.debug('returning final response.')
         return final_response
 
     return api
@@ -203,8 +280,6 @@ def start_api():
 async def shutdown_api():
     """Shut down the API and terminate runners."""
     try:
-        import logging
-        logger = logging.getLogger(__name__)
         logger.info("Starting application shutdown process...")
 
         # # Set a reasonable timeout for the shutdown process
@@ -218,5 +293,4 @@ async def shutdown_api():
         # except asyncio.TimeoutError:
         #     logger.error("Timeout while shutting down runners - some may remain active")
     except Exception as e:
-        import traceback
         logger.error(f"Error during shutdown application: {e}\n{traceback.format_exc()}")
@@ -348,45 +348,55 @@ async def process_runner_request(
         if ready_runner:
             logger.info(f"User {db_user.id} requested runner, got a runner from the pool: {ready_runner}")
 
-            # Replenish the pool if configured
-            if db_image.runner_pool_size != 0:
-                asyncio.create_task(
-                    runner_management.launch_runners(
-                        db_image.identifier,
-                        1,
-                        initiated_by="app_requests_endpoint_pool_replenish"
+            # The runner is committed in its claimed state, so put it back in the pool if the
+            # claim does not go through
+            try:
+                # Replenish the pool if configured
+                if db_image.runner_pool_size != 0:
+                    asyncio.create_task(
+                        runner_management.launch_runners(
+                            db_image.identifier,
+                            1,
+                            initiated_by="app_requests_endpoint_pool_replenish"
+                        )
                     )
-                )
 
-            await emit_status(
-                lifecycle_token,
-                "RESOURCE_DISCOVERY",
-                "Found an available runner in the pool",
-                {
-                    "discovery_type": "pool",
-                    "runner_id": ready_runner.id,
-                    "status": "succeeded"
-                }
-            )
+                await emit_status(
+                    lifecycle_token,
+                    "RESOURCE_DISCOVERY",
+                    "Found an available runner in the pool",
+                    {
+                        "discovery_type": "pool",
+                        "runner_id": ready_runner.id,
+                        "status": "succeeded"
+                    }
+                )
 
-            await emit_status(
-                lifecycle_token,
-                "RESOURCE_ALLOCATION",
-                "Claiming pool runner for your session",
-                {
-                    "allocation_type": "claim_pool",
-                    "runner_id": ready_runner.id,
-                    "status": "in_progress"
-                }
-            )
+                await emit_status(
+                    lifecycle_token,
+                    "RESOURCE_ALLOCATION",
+                    "Claiming pool runner for your session",
+                    {
+                        "allocation_type": "claim_pool",
+                        "runner_id": ready_runner.id,
+                        "status": "in_progress"
+                    }
+                )
 
-            # Claim the pool runner with the updated function signature
-            url = await runner_management.claim_runner(
-                runner=ready_runner,
-                user=db_user,
-                runner_config=runner_config,
-                lifecycle_token=lifecycle_token
-            )
+                # Claim the pool runner with the updated function signature
+                url = await runner_management.claim_runner(
+                    runner=ready_runner,
+                    user=db_user,
+                    runner_config=runner_config,
+                    lifecycle_token=lifecycle_token
+                )
+            except Exception:
+                try:
+                    if runner_management.release_pool_runner(ready_runner):
+                        logger.info(f"Returned runner {ready_runner.id} to the pool after its claim failed")
+                except Exception as release_error:
+                    logger.error(f"Error returning runner {ready_runner.id} to the pool: {release_error!s}")
+                raise
 
             await emit_status(
                 lifecycle_token,
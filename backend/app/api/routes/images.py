@@ -33,7 +33,7 @@ async def create_image(image: ImageCreate, request: Request):
     """
     try:
         # Convert the Pydantic model to a dict and ensure tags is included
-        image_data = image.dict()
+        image_data = image.model_dump()
 
         # Initialize to empty list if None provided
         if image_data.get('tags') is None:
@@ -52,7 +52,7 @@ def read_runners(
     # Transform to response model
     response_runners = []
     for runner, email in runner_results:
-        runner_dict = runner.dict()
+        runner_dict = runner.model_dump()
         runner_dict["user_email"] = email
         response_runners.append(RunnerResponse(**runner_dict))
 
@@ -67,7 +67,7 @@ def read_runner(runner_id: int, request: Request):
         raise HTTPException(status_code=400, detail="Runner not found")
 
     runner, email = runner_result
-    runner_dict = runner.dict()
+    runner_dict = runner.model_dump()
     runner_dict["user_email"] = email
 
     return RunnerResponse(**runner_dict)
@@ -94,7 +94,7 @@ async def update_script(script_id: int, script_update: ScriptUpdate, request: Re
 
     try:
         # Convert Pydantic model to dict, filtering out None values
-        update_data = {k: v for k, v in script_update.dict().items() if v is not None}
+        update_data = {k: v for k, v in script_update.model_dump().items() if v is not None}
 
         if not update_data:
             # If no fields to update, just return the existing script
@@ -3,6 +3,7 @@ import logging
 from typing import get_args
 from app.models.user import User, UserUpdate, UserStatus
 from fastapi import APIRouter, Depends, HTTPException, Response, status, Request
+from fastapi.responses import StreamingResponse
 from workos import exceptions as workos_exceptions
 from app.exceptions.user_exceptions import EmailInUseException, NoSuchRoleException
 from app.schemas.user import UserCreate
@@ -12,11 +13,20 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
-@router.get("/", response_model=list[User])
+@router.get("/", response_class=StreamingResponse, responses={200: {"model": list[User]}})
 @endpoint_permission_decorator.permission_required("users")
 def get_all_users(request: Request):
-    """Retrieve all users."""
-    return user_management.get_all_users()
+    """Retrieve all users, streamed as a JSON array."""
+    return StreamingResponse(_stream_users_json(), media_type="application/json")
+
+def _stream_users_json():
+    """Serialize users into a JSON array one row at a time."""
+    yield "["
+    for index, user in enumerate(user_management.iter_all_users()):
+        if index:
+            yield ","
+        yield user.model_dump_json()
+    yield "]"
 
 @router.get("/{user_id}")
 @router.get("/{user_id}/")
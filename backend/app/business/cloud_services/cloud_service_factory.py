@@ -1,6 +1,8 @@
 # app/business/cloud_services/factory.py
 """Factory for creating cloud services."""
 
+import threading
+from cachetools import TTLCache
 from app.business.cloud_services.base import CloudService
 from app.business.cloud_services.aws import AWSCloudService
 
@@ -12,6 +14,12 @@ CLOUD_SERVICES: dict[str, type[CloudService]] = {
     # "gcp": GCPCloudService,
 }
 
+# Services are expensive to build (AWS creates four boto3 clients), so one instance is shared per
+# connector. The key includes the region and stored credentials, so updating a connector yields a
+# new service, and the TTL bounds how long an unused one is kept.
+_service_cache: TTLCache = TTLCache(maxsize=32, ttl=3600)
+_service_cache_lock = threading.Lock()
+
 def get_cloud_service(connector) -> CloudService:
     """
     Get a cloud service instance for the given connector.
@@ -33,4 +41,12 @@ def get_cloud_service(connector) -> CloudService:
             f"Supported providers are: {supported}"
         )
 
-    return service_class(connector)
+    cache_key = (connector.id, connector.provider, connector.region,
+                 connector.encrypted_access_key, connector.encrypted_secret_key)
+    with _service_cache_lock:
+        service = _service_cache.get(cache_key)
+    if service is None:
+        service = service_class(connector)
+        with _service_cache_lock:
+            _service_cache[cache_key] = service
+    return service
@@ -1,36 +1,55 @@
 # business/encryption.py
-"""Module for encrypting and decrypting text using AES-128 CBC mode with PKCS7 padding."""
+"""
+Module for encrypting and decrypting text using AES-128 CBC mode with PKCS7 padding.
+
+AES runs in OpenSSL through the cryptography package, which uses AES-NI where the CPU has it.
+"""
 
 import os
 import base64
+import hashlib
+from functools import lru_cache
 from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
 from cryptography.hazmat.primitives import padding
 from cryptography.hazmat.backends import default_backend
 
-def encrypt_text(text: str) -> str:
+@lru_cache(maxsize=8)
+def _get_cipher(key_bytes: bytes, iv: bytes) -> Cipher:
     """
-    Encrypts the given text using AES-128 CBC mode with PKCS7 padding.
+    Return the AES-CBC cipher for a key and IV.
 
-    Uses the key from the specified environment variable (default: ENCRYPTION_KEY).
-    The IV is set to be the same as the key (truncated to 16 bytes).
-    Returns a URL-safe Base64 encoded string of IV + ciphertext.
+    A Cipher only holds the algorithm and mode, each encryptor()/decryptor() call creates a
+    fresh context, so one instance can be shared. Since the IV is derived from the key, this
+    is in practice one cipher per process.
     """
-    min_encrypton_length = 16
-    # print("Encrypting text")
+    return Cipher(algorithms.AES(key_bytes), modes.CBC(iv), backend=default_backend())
+
+def _get_key_bytes() -> bytes:
+    """Return the 16 byte AES key from the ENCRYPTION_KEY environment variable."""
+    min_encryption_length = 16
     key = os.getenv("ENCRYPTION_KEY")
     if not key:
         raise ValueError("ENCRYPTION_KEY environment variable is not set.")
 
     key_bytes = key.encode("utf-8")
-    if len(key_bytes) < min_encrypton_length:
+    if len(key_bytes) < min_encryption_length:
         raise ValueError("ENCRYPTION_KEY must be at least 16 bytes long.")
-    key_bytes = key_bytes[:16]
+    return key_bytes[:16]
+
+def encrypt_text(text: str) -> str:
+    """
+    Encrypts the given text using AES-128 CBC mode with PKCS7 padding.
+
+    Uses the key from the specified environment variable (default: ENCRYPTION_KEY).
+    The IV is set to be the same as the key (truncated to 16 bytes).
+    Returns a URL-safe Base64 encoded string of IV + ciphertext.
+    """
+    key_bytes = _get_key_bytes()
 
     # Use key_bytes as the IV (note: not recommended for production)
     iv = key_bytes
 
-    backend = default_backend()
-    cipher = Cipher(algorithms.AES(key_bytes), modes.CBC(iv), backend=backend)
+    cipher = _get_cipher(key_bytes, iv)
 
     # Pad the text so its length is a multiple of 16 bytes.
     padder = padding.PKCS7(128).padder()
@@ -40,7 +59,6 @@ def encrypt_text(text: str) -> str:
     ciphertext = encryptor.update(padded_data) + encryptor.finalize()
 
     encrypted = iv + ciphertext
-    # print("Encrypted text")
     return base64.urlsafe_b64encode(encrypted).decode("utf-8")
 
 def decrypt_text(encrypted_text: str) -> str:
@@ -51,29 +69,26 @@ def decrypt_text(encrypted_text: str) -> str:
     Expects that the first 16 bytes of the decoded data are the IV.
     Returns the original plaintext.
     """
-    min_encryption_length = 16
-    # print("Decrypting text")
-    key = os.getenv("ENCRYPTION_KEY")
-    if not key:
-        raise ValueError("ENCRYPTION_KEY environment variable is not set.")
-
-    key_bytes = key.encode("utf-8")
-    if len(key_bytes) < min_encryption_length:
-        raise ValueError("ENCRYPTION_KEY must be at least 16 bytes long.")
-    key_bytes = key_bytes[:16]
+    key_bytes = _get_key_bytes()
 
     # Decode the encrypted text
     encrypted_bytes = base64.urlsafe_b64decode(encrypted_text)
     iv = encrypted_bytes[:16]
     ciphertext = encrypted_bytes[16:]
 
-    backend = default_backend()
-    cipher = Cipher(algorithms.AES(key_bytes), modes.CBC(iv), backend=backend)
+    cipher = _get_cipher(key_bytes, iv)
     decryptor = cipher.decryptor()
     padded_plaintext = decryptor.update(ciphertext) + decryptor.finalize()
 
     # Unpad the plaintext
     unpadder = padding.PKCS7(128).unpadder()
     plaintext_bytes = unpadder.update(padded_plaintext) + unpadder.finalize()
-    # print("Decrypted text")
     return plaintext_bytes.decode("utf-8")
+
+def digest_text(text: str) -> str:
+    """
+    Return the SHA-256 hex digest of the given text.
+
+    Used as a cache key for tokens so in-memory caches never hold the raw secret as a key.
+    """
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
@@ -25,7 +25,7 @@ def permission_required(resource: Optional[str] = None):
         async def async_wrapper(request: Request, *args, **kwargs):
             # check if AUTH_MODE is on
             if constants.auth_mode == "OFF":
-                print("Auth mode is OFF, skipping permission check")
+                logger.debug("Auth mode is OFF, skipping permission check")
                 return await func(*args, request=request, **kwargs)
 
             # Get the access token
@@ -72,7 +72,7 @@ def permission_required(resource: Optional[str] = None):
                 logger.exception(f"Error in permission check: {e}")
 
             # Permission check passed
-            print("Permission check passed async")
+            logger.debug("Permission check passed async")
             kwargs['request'] = request  # Add request as a keyword argument
             if inspect.iscoroutinefunction(func):
                 return await func(*args, **kwargs)
@@ -83,7 +83,7 @@ def permission_required(resource: Optional[str] = None):
         def sync_wrapper(request: Request, *args, **kwargs):
             # check if AUTH_MODE is on
             if constants.auth_mode == "OFF":
-                print("Auth mode is OFF, skipping permission check")
+                logger.debug("Auth mode is OFF, skipping permission check")
                 return func(*args, request=request, **kwargs)
 
             # Get the access token
@@ -130,7 +130,7 @@ def permission_required(resource: Optional[str] = None):
                 logger.exception(f"Error in permission check: {e}")
 
             # Permission check passed
-            print("Permission check passed sync")
+            logger.debug("Permission check passed sync")
             kwargs['request'] = request  # Add request as a keyword argument
             return func(*args, **kwargs)
 
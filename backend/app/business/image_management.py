@@ -45,7 +45,7 @@ def update_image(image_id: int, updated_image) -> bool:
     if isinstance(updated_image, dict):
         image_data = updated_image
     else:
-        image_data = updated_image.dict(exclude_unset=True)
+        image_data = updated_image.model_dump(exclude_unset=True)
 
     # Ensure tags are properly handled - convert None to empty list
     if 'tags' in image_data and image_data['tags'] is None:
@@ -2,38 +2,61 @@
 
 import os
 import time
+import logging
 import jwt
 import json
 import httpx
+import threading
+from cachetools import TTLCache
 from workos import WorkOSClient
 
 from app.business.workos import get_workos_client
+from app.business.encryption import digest_text
 from app.exceptions.authentication_exceptions import NoMatchingKeyException
-from app.models.pkce_cache import get_key_set, store_key_set
+from app.models.pkce_cache import get_key_set, store_key_sets
+
+logger = logging.getLogger(__name__)
 
 workos = WorkOSClient(api_key=os.getenv("WORKOS_API_KEY"), client_id=os.getenv("WORKOS_CLIENT_ID"))
 
+# Digests of successfully verified access tokens mapped to their exp claim. A cached token is trusted until
+# exp minus VERIFIED_TOKEN_EXP_SKEW, so the RSA signature check runs once per token rather than
+# once per request. The TTL only bounds how long an entry can linger.
+VERIFIED_TOKEN_EXP_SKEW = 30
+_verified_tokens: TTLCache = TTLCache(maxsize=50_000, ttl=300)
+_verified_tokens_lock = threading.Lock()
+
+# Parsed WorkOS signing keys by kid. Keys are loaded at startup and on a kid miss, so verifying a
+# token needs neither a database read nor JWK parsing.
+_signing_keys: dict = {}
+
 
 def decode_token(access_token: str):
     """Decode a token without verifying it's contents."""
-    key_set = find_key_set(kid = jwt.get_unverified_header(access_token)["kid"])
-    key = jwt.algorithms.RSAAlgorithm.from_jwk(key_set)
+    key = find_signing_key(kid = jwt.get_unverified_header(access_token)["kid"])
     return jwt.decode(access_token, key=key, algorithms=["RS256"], options={"verify_signature": False})
 
 def auto_verify_token(access_token: str):
     """Use PyJWT's verify behavior to verify token."""
-    key_set = find_key_set(kid = jwt.get_unverified_header(access_token)["kid"])
-    key = jwt.algorithms.RSAAlgorithm.from_jwk(key_set)
+    key = find_signing_key(kid = jwt.get_unverified_header(access_token)["kid"])
     return jwt.decode(access_token, key=key, algorithms=["RS256"])
 
 def verify_token_exp(access_token: str):
     """Verify token expiration and signature."""
+    token_key = digest_text(access_token)
+    with _verified_tokens_lock:
+        exp = _verified_tokens.get(token_key)
+    if exp is not None:
+        if time.time() < exp - VERIFIED_TOKEN_EXP_SKEW:
+            return True
+        with _verified_tokens_lock:
+            _verified_tokens.pop(token_key, None)
+
     try:
-        key_set = find_key_set(kid=jwt.get_unverified_header(access_token)["kid"])
-        key = jwt.algorithms.RSAAlgorithm.from_jwk(key_set)
+        key = find_signing_key(kid=jwt.get_unverified_header(access_token)["kid"])
 
         # Verify the token with full signature verification
-        jwt.decode(
+        claims = jwt.decode(
             access_token,
             key=key,
             algorithms=["RS256"],
@@ -45,6 +68,9 @@ def verify_token_exp(access_token: str):
         )
 
         # If we get here, verification succeeded
+        if "exp" in claims:
+            with _verified_tokens_lock:
+                _verified_tokens[token_key] = claims["exp"]
         return True
 
     except jwt.ExpiredSignatureError:
@@ -53,11 +79,17 @@ def verify_token_exp(access_token: str):
 
     except (jwt.InvalidTokenError, Exception) as e:
         # Any other validation errors
-        import logging
-        logger = logging.getLogger(__name__)
         logger.error(f"Token verification failed: {e!s}")
         return False
 
+def find_signing_key(kid: str):
+    """Return the parsed public key for a kid, loading it on first use."""
+    key = _signing_keys.get(kid)
+    if key is None:
+        key = jwt.algorithms.RSAAlgorithm.from_jwk(find_key_set(kid = kid))
+        _signing_keys[kid] = key
+    return key
+
 def find_key_set(kid: str):
     """Find a key set in the cache or get from workos."""
     try:
@@ -73,10 +105,17 @@ def update_keys():
     response = httpx.get(workos_client.user_management.get_jwks_url())
     keys = json.loads(response.text)
 
-    for jwk in keys["keys"]:
-        kid = jwk["kid"]
-        keystring = json.dumps(jwk)
-        store_key_set(kid, keystring)
+    key_sets = {jwk["kid"]: json.dumps(jwk) for jwk in keys["keys"]}
+    store_key_sets(key_sets)
+    for kid, keystring in key_sets.items():
+        _signing_keys[kid] = jwt.algorithms.RSAAlgorithm.from_jwk(keystring)
+
+def preload_signing_keys():
+    """Fetch the WorkOS signing keys at startup so the first requests don't pay for it."""
+    try:
+        update_keys()
+    except Exception as e:
+        logger.warning(f"Could not preload WorkOS signing keys, they will load on first use: {e!s}")
 
 def get_user_permissions_from_token(access_token: str) -> list:
     """
@@ -88,7 +127,7 @@ def get_user_permissions_from_token(access_token: str) -> list:
     try:
         # Use your existing function to decode the token
         decoded = decode_token(access_token)
-        print(f"Decoded token: {decoded}")
+        logger.debug("Decoded token: %s", decoded)
 
         # Extract permissions directly from the token
         # Based on the actual token structure you shared
@@ -97,8 +136,6 @@ def get_user_permissions_from_token(access_token: str) -> list:
 
         return []
     except Exception as e:
-        import logging
-        logger = logging.getLogger(__name__)
         logger.error(f"Error extracting permissions from token: {e!s}")
         return []
 
@@ -120,8 +157,6 @@ def user_has_permission(access_token: str, required_permission: str) -> bool:
         # Check if the required permission is in the user's permissions
         return required_permission in user_permissions
     except Exception as e:
-        import logging
-        logger = logging.getLogger(__name__)
         logger.error(f"Error checking user permission: {e!s}")
         return False
 
@@ -103,6 +103,7 @@ def setup_resources():
             session.refresh(cloud_connector)
 
         # 3) Fetch or create default Machine.
+        new_machines = []
         stmt_machine = select(Machine).where(Machine.identifier == "t2.medium")
         db_machine = session.exec(stmt_machine).first()
         if not db_machine:
@@ -116,9 +117,7 @@ def setup_resources():
                 created_by="system",
                 modified_by="system"
             )
-            session.add(db_machine)
-            session.commit()
-            session.refresh(db_machine)
+            new_machines.append(db_machine)
 
         # Add t4g.medium ARM-based machine
         stmt_t4g_machine = select(Machine).where(Machine.identifier == "t4g.medium")
@@ -134,11 +133,17 @@ def setup_resources():
                 created_by="system",
                 modified_by="system"
             )
-            session.add(t4g_machine)
+            new_machines.append(t4g_machine)
+
+        # Missing machines are inserted together, only the new rows are refreshed
+        if new_machines:
+            session.add_all(new_machines)
             session.commit()
-            session.refresh(t4g_machine)
+            for machine in new_machines:
+                session.refresh(machine)
 
         # 4) Fetch or create default Image.
+        new_images = []
         stmt_image = select(Image).where(Image.identifier == "ami-0bbfffa970b0280da")
         db_image = session.exec(stmt_image).first()
         if not db_image:
@@ -152,9 +157,7 @@ def setup_resources():
                 created_by="system",
                 modified_by="system"
             )
-            session.add(db_image)
-            session.commit()
-            session.refresh(db_image)
+            new_images.append(db_image)
 
         # Add new ARM-based image
         stmt_arm_image = select(Image).where(Image.identifier == "ami-03f10f2e6ff098115")
@@ -170,9 +173,14 @@ def setup_resources():
                 created_by="system",
                 modified_by="system"
             )
-            session.add(arm_image)
+            new_images.append(arm_image)
+
+        # Missing images are inserted together, only the new rows are refreshed
+        if new_images:
+            session.add_all(new_images)
             session.commit()
-            session.refresh(arm_image)
+            for image in new_images:
+                session.refresh(image)
 
         # 5) Fetch or create default Script for the "on_awaiting_client" event.
         stmt_script = select(Script).where(Script.event == "on_awaiting_client", Script.image_id == db_image.id)
@@ -343,15 +343,29 @@ def get_existing_runner(user_id: int, image_id: int) -> Runner:
     """Retrieve a runner that is ready for use, else None."""
     return runner_repository.find_runner_by_user_id_and_image_id_and_states(user_id, image_id, ["active", "awaiting_client"])
 
+# Pool states a runner can be claimed from, and the state it is moved to while being claimed
+POOL_CLAIMED_STATES = {"ready": "ready_claimed", "closed_pool": "closed_pool_claimed"}
+
 def get_runner_from_pool(image_id) -> Runner:
-    """Retrieve a runner that is ready or closed for use from the pool, else None."""
-    with Session(engine) as session:
-        # Try to get a ready runner first
-        ready_runner = runner_repository.find_runner_by_image_id_and_states(image_id, ["ready"])
-        if ready_runner:
-            return ready_runner
-        # If no ready runner, try to return a closed runner
-        return runner_repository.find_runner_by_image_id_and_states(image_id, ["closed_pool"])
+    """Claim a runner that is ready or closed for use from the pool, else None."""
+    # Try to get a ready runner first
+    ready_runner = runner_repository.find_runner_by_image_id_and_states(image_id, ["ready"], POOL_CLAIMED_STATES["ready"])
+    if ready_runner:
+        return ready_runner
+    # If no ready runner, try to return a closed runner
+    return runner_repository.find_runner_by_image_id_and_states(image_id, ["closed_pool"], POOL_CLAIMED_STATES["closed_pool"])
+
+def release_pool_runner(runner: Runner) -> bool:
+    """
+    Return a runner claimed by get_runner_from_pool to the pool after its claim failed.
+
+    The claimed state is not counted by the pool manager nor swept by the expiry cleanup, so
+    without this a failed claim would strand the runner.
+    """
+    for pool_state, claimed_state in POOL_CLAIMED_STATES.items():
+        if runner.state == claimed_state:
+            return runner_repository.release_claimed_runner(runner.id, claimed_state, pool_state)
+    return False
 
 async def claim_runner(
     runner: Runner,
@@ -371,7 +385,7 @@ async def claim_runner(
         # Update the runner state quickly to avoid race condition
         previous_state = runner.state
         # Check if the claimed runner was closed. If so, we need to claim & start the runner prior
-        if previous_state == "closed_pool":
+        if previous_state in ("closed_pool", "closed_pool_claimed"):
             # We need to swap the state to runner_starting_claimed ASAP
             runner.state = "closed_pool_claimed"
             if lifecycle_token:
@@ -486,7 +500,7 @@ async def claim_runner(
             logger.info(f"Found image: id={image.id}, cloud_connector_id={getattr(image, 'cloud_connector_id', None)}")
 
             if image and image.cloud_connector_id:
-                cloud_connector = cloud_connector_repository.find_cloud_connector_by_id(
+                cloud_connector = cloud_connector_repository.get_cached_cloud_connector(
                     image.cloud_connector_id
                 )
                 logger.info(f"Found cloud connector: id={cloud_connector.id}, provider={getattr(cloud_connector, 'provider', 'unknown')}")
@@ -769,7 +783,7 @@ async def stop_runner(runner_id: int, initiated_by: str = "system") -> dict:
             cloud_connector = None
 
             if image and image.cloud_connector_id:
-                cloud_connector = cloud_connector_repository.find_cloud_connector_by_id(
+                cloud_connector = cloud_connector_repository.get_cached_cloud_connector(
                     image.cloud_connector_id
                 )
 
@@ -881,7 +895,7 @@ async def start_runner(runner_id: int, initiated_by: str = "user") -> dict:
             cloud_connector = None
 
             if image and image.cloud_connector_id:
-                cloud_connector = cloud_connector_repository.find_cloud_connector_by_id(
+                cloud_connector = cloud_connector_repository.get_cached_cloud_connector(
                     image.cloud_connector_id
                 )
 
@@ -963,9 +977,7 @@ async def start_runner(runner_id: int, initiated_by: str = "user") -> dict:
 
 def auth_runner(runner_id: int, runner_token: str):
     """Check the runner's hash against a provided auth token."""
-    with Session(engine) as session:
-        runner : Runner = runner_repository.find_runner_by_id(runner_id)
-        return runner.external_hash == runner_token
+    return runner_repository.runner_token_is_valid(runner_id, runner_token)
 
 def get_devserver(runner_id: int, port: int):
     """Form a devserver URL."""
@@ -1133,30 +1145,34 @@ async def shutdown_runners(instance_ids: list, initiated_by: str = "system") ->
     """
     print(f"shutdown_runners called with instance_ids: {instance_ids}")
     results = []
+    # Resolve every instance id with a single query rather than one per runner
+    runners_by_instance_id = {
+        runner.identifier: runner
+        for runner in runner_repository.find_runners_by_instance_ids(list(instance_ids))
+    }
     for instance_id in instance_ids:
-        with Session(engine) as session:
-            runner = runner_repository.find_runner_by_instance_id(instance_id)
-            if not runner:
-                results.append({
-                    "runner_instance_id": instance_id,
-                    "status": "error",
-                    "message": "Runner not found"
-                })
-                continue
-
-            # Queue the task
-            task = shutdown_runner.process_runner_shutdown.delay(
-                runner_id=runner.id,
-                instance_id=runner.identifier,
-                initiated_by=initiated_by
-            )
-
+        runner = runners_by_instance_id.get(instance_id)
+        if not runner:
             results.append({
-                "runner_id": runner.id,
-                "status": "queued",
-                "task_id": task.id,
-                "message": "Shutdown process queued"
+                "runner_instance_id": instance_id,
+                "status": "error",
+                "message": "Runner not found"
             })
+            continue
+
+        # Queue the task
+        task = shutdown_runner.process_runner_shutdown.delay(
+            runner_id=runner.id,
+            instance_id=runner.identifier,
+            initiated_by=initiated_by
+        )
+
+        results.append({
+            "runner_id": runner.id,
+            "status": "queued",
+            "task_id": task.id,
+            "message": "Shutdown process queued"
+        })
 
     return results
 
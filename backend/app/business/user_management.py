@@ -2,18 +2,16 @@
 import logging
 import os
 from app.db import user_repository
-from sqlmodel import Session
 from app.util.constants import default_role_name
-from app.db.database import engine
 from app.exceptions.user_exceptions import EmailInUseException
 from app.models.user import User, UserUpdate
 from app.business.workos import create_workos_user, create_organization_membership, delete_workos_user
 
 logger = logging.getLogger(__name__)
 
-def get_all_users():
-    """Read all users from the database."""
-    return user_repository.get_all_users()
+def iter_all_users():
+    """Stream all users from the database."""
+    return user_repository.iter_all_users()
 
 def get_user_by_email(email: str):
     """
@@ -52,14 +50,9 @@ def create_user(*, password: str, user: User) -> User:
         organization_id=os.getenv('WORKOS_ORG_ID')
     )
 
-    # Persist and refresh user
-    user = user_repository.persist_user(user)
-    print(f"Persisted user: {user}")
-
-    # Set default role
+    # Persist the user and its default role in a single transaction
     default_role = user_repository.read_role(default_role_name)
-    user_repository.assign_role(user=user, role_id=default_role.id)
-    return user
+    return user_repository.persist_user_with_roles(user, [default_role.id])
 
 def update_user(user: UserUpdate):
     """Update a user with UserUpdate object."""
@@ -1,7 +1,20 @@
 """Repository layer for the CloudConnector entity."""
+import threading
+from cachetools import TTLCache
 from app.models import CloudConnector
 from sqlmodel import Session, select
-from app.db.database import engine
+from app.db.database import engine, SessionLocal
+
+# Connectors are read-mostly configuration looked up by every runner task. Read-only callers go
+# through get_cached_cloud_connector, writes in this module evict, and the TTL bounds how long
+# other workers may see a changed connector.
+_cloud_connector_cache: TTLCache = TTLCache(maxsize=64, ttl=60)
+_cloud_connector_cache_lock = threading.Lock()
+
+def _evict_cloud_connector(cloud_connector_id: int):
+    """Drop a connector from the cache after it changed."""
+    with _cloud_connector_cache_lock:
+        _cloud_connector_cache.pop(int(cloud_connector_id), None)
 
 def find_all_cloud_connectors() -> list[CloudConnector]:
     """Select all cloud connectors."""
@@ -15,6 +28,24 @@ def find_cloud_connector_by_id(id: str) -> CloudConnector:
         statement = select(CloudConnector).where(CloudConnector.id == id)
         return session.exec(statement).first()
 
+def get_cached_cloud_connector(id: int) -> CloudConnector:
+    """
+    Select a cloud connector by its ID, served from a short-lived per-process cache.
+
+    The returned instance is shared and detached, callers must only read it.
+    """
+    with _cloud_connector_cache_lock:
+        cloud_connector = _cloud_connector_cache.get(int(id))
+    if cloud_connector is not None:
+        return cloud_connector
+
+    with SessionLocal() as session:
+        cloud_connector = session.get(CloudConnector, id)
+    if cloud_connector is not None:
+        with _cloud_connector_cache_lock:
+            _cloud_connector_cache[int(id)] = cloud_connector
+    return cloud_connector
+
 def create_cloud_connector(cloud_connector: CloudConnector) -> CloudConnector:
     """Insert a new cloud connector."""
     with Session(engine) as session:
@@ -30,11 +61,12 @@ def update_cloud_connector(cloud_connector_id: int, cloud_connector_data: CloudC
         if not db_cloud_connector:
             return None
 
-        for key, value in cloud_connector_data.dict(exclude_unset=True).items():
+        for key, value in cloud_connector_data.model_dump(exclude_unset=True).items():
             if hasattr(db_cloud_connector, key) and key != "id":
                 setattr(db_cloud_connector, key, value)
         session.add(db_cloud_connector)
         session.commit()
+        _evict_cloud_connector(cloud_connector_id)
         return db_cloud_connector
 
 def update_connector_status(cloud_connector_id: int, is_active: bool) -> CloudConnector:
@@ -66,6 +98,7 @@ def update_connector_status(cloud_connector_id: int, is_active: bool) -> CloudCo
             session.add(cloud_connector)
             session.commit()
             session.refresh(cloud_connector)
+            _evict_cloud_connector(cloud_connector_id)
 
         return cloud_connector
 
@@ -79,4 +112,5 @@ def delete_cloud_connector(cloud_connector_id: int) -> CloudConnector:
         db_cloud_connector.status = "deleted"
         session.add(db_cloud_connector)
         session.commit()
+        _evict_cloud_connector(cloud_connector_id)
         return True
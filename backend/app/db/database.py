@@ -3,8 +3,12 @@
 import os
 import logging
 import time
+import orjson
 from contextlib import contextmanager
-from sqlmodel import SQLModel, create_engine, Session, select
+from typing import Optional
+from sqlmodel import SQLModel, create_engine, Session
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.dialects import mysql
 from dotenv import load_dotenv
 from sqlalchemy.exc import OperationalError, PendingRollbackError, InterfaceError
 
@@ -21,6 +25,11 @@ POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
 MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
 POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "900"))  # 15 minutes
 POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "30"))
+QUERY_CACHE_SIZE = int(os.getenv("DB_QUERY_CACHE_SIZE", "1200"))
+
+def _json_serializer(value) -> str:
+    """Serialize JSON column values with orjson. Non-string keys are stringified like the stdlib does."""
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
 
 # Create engine with optimized connection pool settings
 engine = create_engine(
@@ -31,11 +40,20 @@ engine = create_engine(
     pool_size=POOL_SIZE,                  # Maximum number of persistent connections
     max_overflow=MAX_OVERFLOW,            # Allow this many extra connections when pool is full
     pool_timeout=POOL_TIMEOUT,            # Wait this many seconds for a connection
+    pool_use_lifo=True,                   # Reuse the most recent connection so surplus ones idle out and recycle
+    query_cache_size=QUERY_CACHE_SIZE,    # Compiled statement cache, room for every statement shape the app issues
+    json_serializer=_json_serializer,     # JSON columns (env_data, event_data, rules) go through orjson
+    json_deserializer=orjson.loads,
     connect_args={                        # MySQL specific arguments
         "connect_timeout": 10,            # Connection timeout in seconds
     }
 )
 
+# Session factory for code that hands ORM objects back to callers after committing. Instances
+# keep the values they were written with instead of being expired, so no follow-up SELECT
+# (refresh or lazy reload) is needed once the session closes.
+SessionLocal = sessionmaker(engine, class_=Session, expire_on_commit=False)
+
 def reset_db_connection():
     """Reset database connection pool."""
     try:
@@ -44,6 +62,17 @@ def reset_db_connection():
     except Exception as e:
         logger.error(f"Error resetting database connection pool: {e}")
 
+def insert_ignoring_duplicates(model, rows: list[dict], key: str):
+    """
+    Build a single multi-row INSERT for the model that skips rows whose key already exists.
+
+    Lets seeding and caching code insert idempotently in one round trip instead of selecting
+    first, and stays safe when several workers run it at the same time.
+    """
+    statement = mysql.insert(model).values(rows)
+    # Assigning the key to itself turns a duplicate into a no-op
+    return statement.on_duplicate_key_update({key: statement.inserted[key]})
+
 def create_db_and_tables():
     """Create the database and tables if they don't already exist."""
     # Import them in order of dependencies (tables with no foreign keys first)
@@ -68,15 +97,14 @@ def create_db_and_tables():
         reset_db_connection()
         raise
 
-    # Populate roles only if they don't already exist
+    # Populate the default roles, existing ones are left untouched
     try:
-        with get_session_context() as session:
-            # Import here to avoid circular imports
-            from app.models import role
-            existing_role = session.exec(select(role.Role)).first()
-            if not existing_role:
-                role.populate_roles()
-                logger.info("Populated default roles")
+        # Import here to avoid circular imports
+        from app.models import role
+        from app.db import user_repository
+        role.populate_roles()
+        user_repository.clear_role_cache()
+        logger.info("Populated default roles")
     except Exception as e:
         logger.error(f"Failed to populate roles: {e!s}")
 
@@ -61,7 +61,7 @@ def update_image(image_id: int, image_data) -> Image:
 
         # Handle both dict and Image objects
         if not isinstance(image_data, dict):
-            image_data = image_data.dict(exclude_unset=True)
+            image_data = image_data.model_dump(exclude_unset=True)
 
         for key, value in image_data.items():
             if hasattr(db_image, key) and key != "id":
@@ -1,51 +1,55 @@
 """Repository layer for the Runner entity."""
 from app.models import Runner, User
-from sqlmodel import Session, select
+from app.models.runner import ALIVE_RUNNER_STATES
+from sqlmodel import Session, select, update
+from sqlalchemy import exists
 from typing import Optional
-from app.db.database import engine
+from app.db.database import engine, SessionLocal
 
 def add_runner(new_runner: Runner) -> Runner:
     """Add a new runner, flush to retrieve ID."""
-    with Session(engine) as session:
+    with SessionLocal() as session:
         session.add(new_runner)
         session.commit()
-        session.refresh(new_runner)
         return new_runner
 
 def find_all_runners() -> list[Runner]:
     """Retrieve all runners."""
     with Session(engine) as session:
         statement = select(Runner)
-        return session.exec(statement).all()
+        return session.scalars(statement).all()
 
 def find_runners_by_status(status: str) -> list[Runner]:
     """Find runners with a specific status."""
     with Session(engine) as session:
         query = select(Runner).where(Runner.state == status)
-        return session.exec(query).all()
+        return session.scalars(query).all()
 
 def find_alive_runners() -> list[Runner]:
     """Find runners in 'alive' states."""
     with Session(engine) as session:
-        alive_states = [
-            "runner_starting", "app_starting", "ready",
-            "runner_starting_claimed", "ready_claimed", "setup",
-            "awaiting_client", "active", "disconnecting", "disconnected"
-        ]
-        query = select(Runner).where(Runner.state.in_(alive_states))
-        return session.exec(query).all()
+        query = select(Runner).where(Runner.state.in_(ALIVE_RUNNER_STATES))
+        return session.scalars(query).all()
 
 def find_runner_by_id(id: int) -> Runner:
     """Retrieve the runner by its ID."""
     with Session(engine) as session:
         statement = select(Runner).where(Runner.id == id)
-        return session.exec(statement).first()
+        return session.scalar(statement)
 
 def find_runner_by_instance_id(instance_id: str) -> Runner:
     """Retrieve the runner by its instance ID."""
     with Session(engine) as session:
         statement = select(Runner).where(Runner.identifier == instance_id)
-        return session.exec(statement).first()
+        return session.scalar(statement)
+
+def find_runners_by_instance_ids(instance_ids: list[str]) -> list[Runner]:
+    """Retrieve the runners with any of the given instance IDs in one query."""
+    if not instance_ids:
+        return []
+    with Session(engine) as session:
+        statement = select(Runner).where(Runner.identifier.in_(instance_ids))
+        return session.scalars(statement).all()
 
 def find_runner_by_user_id_and_image_id_and_states(user_id: int, image_id: int, states: list[str]):
     """Retrieve the runner by its user id, image id, and state. Query used to find the user's already existing runner."""
@@ -55,29 +59,57 @@ def find_runner_by_user_id_and_image_id_and_states(user_id: int, image_id: int,
             Runner.state.in_(states),  # Changed to include awaiting_client too
             Runner.image_id == image_id
         )
-        return session.exec(stmt_runner).first()
+        return session.scalar(stmt_runner)
 
-def find_runner_by_image_id_and_states(image_id: int, states: list[str]):
+def find_runner_by_image_id_and_states(image_id: int, states: list[str], claimed_state: str) -> Optional[Runner]:
     """
-    Retrieve the runner by its image id and state.
+    Claim the oldest runner with the given image id and state out of the pool.
 
-    Query used to pull a runner out of the pool.
-    TODO: We should be getting the oldest runner out of this query. That would allow it to accrue
-    more bursting credits.
+    The row is read with SELECT ... FOR UPDATE SKIP LOCKED and moved to claimed_state in the
+    same transaction, so concurrent requests never pull the same runner and never block on
+    each other. The oldest runner is chosen so it has accrued the most bursting credits.
     """
-    with Session(engine) as session:
-        stmt_runner = select(Runner).where(
-            Runner.state.in_(states),
-            Runner.image_id == image_id
+    with SessionLocal() as session:
+        stmt_runner = (
+            select(Runner)
+            .where(
+                Runner.state.in_(states),
+                Runner.image_id == image_id
+            )
+            .order_by(Runner.created_on.asc())
+            .limit(1)
+            .with_for_update(skip_locked=True)
         )
-        return session.exec(stmt_runner).first()
+        runner = session.scalar(stmt_runner)
+        if runner:
+            runner.state = claimed_state
+            session.add(runner)
+            session.commit()
+        return runner
+
+def release_claimed_runner(runner_id: int, claimed_state: str, state: str) -> bool:
+    """
+    Move a runner from claimed_state back to the pool state it was claimed from.
+
+    Only applies while the runner is still in claimed_state, so a claim that already moved it
+    on is left alone. Returns whether the runner was released.
+    """
+    with SessionLocal() as session:
+        result = session.exec(
+            update(Runner)
+            .where(Runner.id == runner_id, Runner.state == claimed_state)
+            .values(state=state)
+        )
+        session.commit()
+        return result.rowcount > 0
 
 def update_runner(runner: Runner) -> Runner:
     """Update a runner."""
-    with Session(engine) as session:
+    # Only the changed columns are flushed, and the instance keeps its values after commit,
+    # so no refresh SELECT is needed
+    with SessionLocal() as session:
         session.add(runner)
         session.commit()
-        session.refresh(runner)
         return runner
 
 def update_whole_runner(runner_id: int, runner_data: Runner) -> Runner:
@@ -87,44 +119,53 @@ def update_whole_runner(runner_id: int, runner_data: Runner) -> Runner:
         if not db_runner:
             return None
 
-        for key, value in runner_data.dict(exclude_unset=True).items():
+        for key, value in runner_data.model_dump(exclude_unset=True).items():
             if hasattr(db_runner, key) and key != "id":
                 setattr(db_runner, key, value)
 
         session.add(db_runner)
         return db_runner
 
+def _find_runner_by_token(column, token: str, runner_id: Optional[int] = None) -> Optional[Runner]:
+    """Select the first runner whose token column matches, optionally scoped to a runner id."""
+    with Session(engine) as session:
+        stmt = select(Runner).where(column == token)
+        if runner_id is not None:
+            stmt = stmt.where(Runner.id == runner_id)
+        return session.scalar(stmt.limit(1))
+
 def find_runner_with_lifecycle_token(token: str) -> Optional[Runner]:
     """
     Find a runner with the given lifecycle token.
 
     Args:
-        session: Database session
         token: The lifecycle token to look for
 
     Returns:
         Runner object if found, None otherwise
     """
+    return _find_runner_by_token(Runner.lifecycle_token, token)
+
+def runner_token_is_valid(runner_id: int, token: str) -> bool:
+    """
+    Check whether a runner's external hash matches the given token.
+
+    Issues an EXISTS query so the runner row is never loaded into the ORM.
+    """
     with Session(engine) as session:
-        stmt = select(Runner).where(Runner.lifecycle_token == token)
-        return session.exec(stmt).first()
+        stmt = select(exists().where(
+            Runner.id == runner_id,
+            Runner.external_hash == token
+        ))
+        return bool(session.scalar(stmt))
 
 def find_runner_with_id_and_terminal_token(runner_id:int, token: str) -> Runner:
     """Select a runner with a matching terminal token."""
-    with Session(engine) as session:
-        stmt_runner = select(Runner).where(
-            Runner.id == runner_id,
-            Runner.terminal_token == token
-        )
-        return session.exec(stmt_runner).first()
+    return _find_runner_by_token(Runner.terminal_token, token, runner_id=runner_id)
 
 def find_runner_with_terminal_token(token: str) -> Runner:
     """Select a runner with a matching terminal token."""
-    with Session(engine) as session:
-        stmt_runner = select(Runner).where(
-            Runner.terminal_token == token
-        )
-        return session.exec(stmt_runner).first()
+    return _find_runner_by_token(Runner.terminal_token, token)
 
 # Add to runner_repository.py
 def find_runners_by_image_id(image_id: int) -> list[Runner]:
@@ -139,20 +180,7 @@ def find_runners_by_image_id(image_id: int) -> list[Runner]:
         A list of Runner objects
     """
     with Session(engine) as session:
-        return session.exec(select(Runner).where(Runner.image_id == image_id)).all()
-
-def delete_runner(runner_id: int) -> None:
-    """
-    Delete a specific runner by ID.
-
-    Args:
-        session: The database session
-        runner_id: The ID of the runner to delete
-    """
-    with Session(engine) as session:
-        runner = session.get(Runner, runner_id)
-        if runner:
-            session.delete(runner)
+        return session.scalars(select(Runner).where(Runner.image_id == image_id)).all()
 
 # With user_email
 # Add these functions to app/db/runner_repository.py
@@ -173,12 +201,7 @@ def find_runners_by_status_with_user_email(status: str) -> list[tuple[Runner, Op
 def find_alive_runners_with_user_email() -> list[tuple[Runner, Optional[str]]]:
     """Find runners in 'alive' states and include user email."""
     with Session(engine) as session:
-        alive_states = [
-            "runner_starting", "app_starting", "ready",
-            "runner_starting_claimed", "ready_claimed", "setup",
-            "awaiting_client", "active", "disconnecting", "disconnected"
-        ]
-        query = select(Runner, User.email).outerjoin(User, Runner.user_id == User.id).where(Runner.state.in_(alive_states))
+        query = select(Runner, User.email).outerjoin(User, Runner.user_id == User.id).where(Runner.state.in_(ALIVE_RUNNER_STATES))
         return session.exec(query).all()
 
 def find_runner_by_id_with_user_email(id: int) -> tuple[Runner, Optional[str]]:
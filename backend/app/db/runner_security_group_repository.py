@@ -32,26 +32,3 @@ def find_runners_by_security_group_id(security_group_id: int) -> list[int]:
             RunnerSecurityGroup.security_group_id == security_group_id
         )
         return session.exec(statement).all()
-
-def delete_runner_security_group(runner_id: int, security_group_id: int) -> None:
-    """Remove the association between a runner and a security group."""
-    with Session(engine) as session:
-        statement = select(RunnerSecurityGroup).where(
-            RunnerSecurityGroup.runner_id == runner_id,
-            RunnerSecurityGroup.security_group_id == security_group_id
-        )
-        runner_security_group = session.exec(statement).first()
-        if runner_security_group:
-            session.delete(runner_security_group)
-            session.flush()
-
-def delete_all_runner_security_groups(runner_id: int) -> None:
-    """Remove all security group associations for a specific runner."""
-    with Session(engine) as session:
-        statement = select(RunnerSecurityGroup).where(
-            RunnerSecurityGroup.runner_id == runner_id
-        )
-        runner_security_groups = session.exec(statement).all()
-        for runner_security_group in runner_security_groups:
-            session.delete(runner_security_group)
-        session.flush()
@@ -1,9 +1,9 @@
 """Repository layer for the Script entity."""
 
-from sqlmodel import Session, select
+from sqlmodel import Session, delete, select, update
 from typing import Any, Optional
 from app.models.script import Script
-from app.db.database import engine
+from app.db.database import engine, SessionLocal
 
 def find_script_by_event_and_image_id(event: str, image_id: int):
     """Get scripts by event and image id."""
@@ -47,10 +47,9 @@ def find_scripts_by_image_id(image_id: int) -> list[Script]:
 
 def create_script(script: Script) -> Script:
     """Create a new script."""
-    with Session(engine) as session:
+    with SessionLocal() as session:
         session.add(script)
         session.commit()
-        session.refresh(script)
         return script
 
 
@@ -66,22 +65,17 @@ def update_script(script_id: int, update_data: dict[str, Any]) -> Script:
     Returns:
         Updated Script object
     """
-    with Session(engine) as session:
-    # Get the script to update
+    # Only real columns are written, anything else in update_data is ignored as before
+    values = {key: value for key, value in update_data.items() if key in Script.__table__.columns and key != "id"}
+    with SessionLocal() as session:
+        # Apply the patch with one UPDATE rather than loading the row first
+        if values:
+            session.exec(update(Script).where(Script.id == script_id).values(**values))
+            session.commit()
+
         script = session.get(Script, script_id)
         if not script:
             raise ValueError(f"Script with ID {script_id} not found")
-
-        # Update the script attributes
-        for key, value in update_data.items():
-            if hasattr(script, key):
-                setattr(script, key, value)
-
-        # Save changes
-        session.add(script)
-        session.commit()
-        session.refresh(script)
-
         return script
 
 
@@ -97,35 +91,6 @@ def delete_script(script_id: int) -> bool:
         True if successful, False otherwise
     """
     with Session(engine) as session:
-        script = session.get(Script, script_id)
-        if not script:
-            return False
-
-        session.delete(script)
-        session.commit()
-        return True
-
-
-def delete_scripts_by_image_id(image_id: int) -> int:
-    """
-    Delete all scripts for a specific image.
-
-    Args:
-        session: Database session
-        image_id: ID of the image
-
-    Returns:
-        Number of scripts deleted
-    """
-    with Session(engine) as session:
-        # First, get all scripts for this image to count them
-        stmt = select(Script).where(Script.image_id == image_id)
-        scripts = session.exec(stmt).all()
-        count = len(scripts)
-
-        # Delete all scripts for this image
-        for script in scripts:
-            session.delete(script)
-
+        result = session.exec(delete(Script).where(Script.id == script_id))
         session.commit()
-        return count
+        return result.rowcount > 0
@@ -2,7 +2,7 @@
 """Repository layer for the SecurityGroup entity."""
 from app.models.security_group import SecurityGroup
 from sqlmodel import Session, select
-from app.db.database import engine
+from app.db.database import engine, SessionLocal
 
 def add_security_group(new_security_group: SecurityGroup) -> SecurityGroup:
     """Add a new security group, flush to retrieve ID."""
@@ -44,10 +44,9 @@ def find_security_group_by_cloud_group_id(cloud_group_id: str) -> SecurityGroup:
 
 def update_security_group(security_group: SecurityGroup) -> SecurityGroup:
     """Update an existing security group."""
-    with Session(engine) as session:
+    with SessionLocal() as session:
         session.add(security_group)
         session.commit()
-        session.refresh(security_group)
         return security_group
 
 def delete_security_group(security_group: SecurityGroup) -> None:
@@ -1,46 +1,127 @@
 """Repository layer for the User entity."""
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Optional
+from cachetools import TTLCache
 from app.models import User
 from app.models import UserRole
-from sqlmodel import Session, select
+from sqlmodel import delete, select
 from app.exceptions.user_exceptions import NoSuchRoleException
 from app.models.role import Role
 from app.models.user import UserUpdate
-from app.db.database import engine
+from app.db.database import SessionLocal
 
-def get_all_users():
-    """Read all users from the user table."""
-    with Session(engine) as session:
-        return session.exec(select(User)).all()
+logger = logging.getLogger(__name__)
+
+# Users looked up by email are cached for USER_EMAIL_CACHE_TTL seconds, keyed by normalized email.
+# The cache holds a plain snapshot of the row and every hit builds a fresh User from it, so no
+# ORM instance is shared between requests. Write paths below evict the affected email, but only
+# in this process: other API workers can serve an updated or deleted user until the TTL runs out,
+# which is why it is kept short.
+USER_EMAIL_CACHE_TTL = 30
+_user_email_cache: TTLCache = TTLCache(maxsize=10000, ttl=USER_EMAIL_CACHE_TTL)
+_user_email_cache_lock = threading.RLock()
+
+# Roles looked up by name are cached as immutable snapshots for ROLE_CACHE_TTL seconds. Every role
+# write clears the cache in this process, the TTL bounds how long other workers can lag behind.
+ROLE_CACHE_TTL = 300
+_role_cache: TTLCache = TTLCache(maxsize=64, ttl=ROLE_CACHE_TTL)
+_role_cache_lock = threading.Lock()
+
+@dataclass(frozen=True)
+class RoleRecord:
+    """Immutable snapshot of a role row."""
+
+    id: int
+    name: str
+
+def _normalize_email(email: str) -> str:
+    """Return the cache key for an email."""
+    return email.strip().lower()
+
+def _evict_user_email(*emails: Optional[str]):
+    """Drop cached users for the given emails."""
+    with _user_email_cache_lock:
+        for email in emails:
+            if email:
+                _user_email_cache.pop(_normalize_email(email), None)
+
+def iter_all_users(chunk_size: int = 1000):
+    """
+    Stream all users from the user table in id order.
+
+    Users are read in keyset batches of chunk_size (id > last id seen), each batch in its
+    own short session, so no connection is held while the caller consumes the rows.
+    """
+    last_id = 0
+    while True:
+        with SessionLocal() as session:
+            statement = select(User).where(User.id > last_id).order_by(User.id).limit(chunk_size)
+            users = session.exec(statement).all()
+        yield from users
+        if len(users) < chunk_size:
+            return
+        last_id = users[-1].id
 
 def get_user_by_email(email: str)->User:
-    """Retrieve the user by their email."""
-    with Session(engine) as session:
-        statement = select(User).where(User.email == email)
-        return session.exec(statement).first()
+    """Retrieve the user by their email, served from the TTL cache when possible."""
+    key = _normalize_email(email)
+    with _user_email_cache_lock:
+        snapshot = _user_email_cache.get(key)
+    if snapshot is not None:
+        return User.model_validate(snapshot)
+
+    with SessionLocal() as session:
+        statement = select(User).where(User.email == email).limit(1)
+        user = session.scalar(statement)
+
+    # Misses are not cached so a newly created user is visible immediately
+    if user is not None:
+        with _user_email_cache_lock:
+            _user_email_cache[key] = user.model_dump()
+    return user
 
 def get_user_by_id(user_id: int):
     """Get a user record from the database."""
-    with Session(engine) as session:
+    with SessionLocal() as session:
         return session.get(User, user_id)
 
 def persist_user(user: User):
     """Create a user record in the database."""
-    with Session(engine) as session:
+    with SessionLocal() as session:
         session.add(user)
         session.commit()
-        session.refresh(user)
-        print(f"Persisted user: {user}")
+        _evict_user_email(user.email)
+        logger.debug("Persisted user: %s", user)
+        return user
+
+def persist_user_with_roles(user: User, role_ids: list[int]):
+    """
+    Create a user record together with its role assignments in one transaction.
+
+    The user is flushed to obtain its id, the UserRole rows are added, and everything is
+    committed once.
+    """
+    with SessionLocal() as session:
+        session.add(user)
+        session.flush()
+        session.add_all([UserRole(user_id = user.id, role_id = role_id) for role_id in role_ids])
+        session.commit()
+        _evict_user_email(user.email)
+        logger.debug("Persisted user: %s", user)
         return user
 
 def update_user(user: UserUpdate):
     """Update a user record in the database."""
-    with Session(engine) as session:
+    with SessionLocal() as session:
         user_from_db = session.get(User, user.id)
+        old_email = user_from_db.email
         user_data = user.model_dump(exclude_unset=True)
         user_from_db.sqlmodel_update(user_data)
         session.add(user_from_db)
         session.commit()
-        session.refresh(user_from_db)
+        _evict_user_email(old_email, user_from_db.email)
         return user_from_db
 
 def delete_user(user_id: int):
@@ -49,32 +130,52 @@ def delete_user(user_id: int):
 
     Previously this physically deleted the record.
     """
-    with Session(engine) as session:
-        user = get_user_by_id(user_id)
+    with SessionLocal() as session:
+        user = session.get(User, user_id)
         if user:
             user.status = "deleted"
             session.add(user)
             session.commit()
-            session.refresh(user)
+            _evict_user_email(user.email)
             return user
         return None
 
 def assign_role(user: User, role_id: int):
     """Assign a role to a user."""
-    with Session(engine) as session:
+    with SessionLocal() as session:
         user_role: UserRole = UserRole(user_id = user.id, role_id = role_id)
         session.add(user_role)
         session.commit()
 
 def remove_role(role_id: int):
     """Remove a role from the database."""
-    with Session(engine) as session:
-        session.delete(role_id)
-
-def read_role(name: str):
-    """Get a role from db."""
-    with Session(engine) as session:
-        role: Role = session.exec(select(Role).where(Role.name == name)).first()
-        if not role:
-            raise NoSuchRoleException('Role not found.')
+    with SessionLocal() as session:
+        session.exec(delete(Role).where(Role.id == role_id))
+        session.commit()
+    clear_role_cache()
+
+def clear_role_cache():
+    """Drop every cached role, called after any write to the role table."""
+    with _role_cache_lock:
+        _role_cache.clear()
+
+def read_role(name: str) -> RoleRecord:
+    """
+    Get a role from db, served from the TTL cache when possible.
+
+    A missing role raises and is therefore never cached.
+    """
+    with _role_cache_lock:
+        role = _role_cache.get(name)
+    if role is not None:
         return role
+
+    with SessionLocal() as session:
+        db_role: Role = session.scalars(select(Role).filter_by(name=name).limit(1)).first()
+        if not db_role:
+            raise NoSuchRoleException('Role not found.')
+        role = RoleRecord(id=db_role.id, name=db_role.name)
+
+    with _role_cache_lock:
+        _role_cache[name] = role
+    return role
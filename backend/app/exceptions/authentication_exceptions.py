@@ -1,37 +1,11 @@
 """This file contains custom exceptions which may be raised during the PKCE key caching process."""
+from app.exceptions.base_exceptions import MessageException
 
-class NoMatchingKeyException(Exception):
+class NoMatchingKeyException(MessageException):
     """Exception raised for no matching keys in the cache."""
 
-    def __init__(self, message):
-        """Construct an exception."""
-        self.message = message
-        super().__init__(message)
-
-    def __str__(self):
-        """ToString implementation."""
-        return f"{self.message})"
-
-class BadRefreshException(Exception):
+class BadRefreshException(MessageException):
     """Exception raised for no matching keys in the cache."""
 
-    def __init__(self, message):
-        """Construct an exception."""
-        self.message = message
-        super().__init__(message)
-
-    def __str__(self):
-        """ToString implementation."""
-        return f"{self.message})"
-
-class NoRefreshSessionFound(Exception):
+class NoRefreshSessionFound(MessageException):
     """Exception raised for no matching keys in the cache."""
-
-    def __init__(self, message):
-        """Construct an exception."""
-        self.message = message
-        super().__init__(message)
-
-    def __str__(self):
-        """ToString implementation."""
-        return f"{self.message})"
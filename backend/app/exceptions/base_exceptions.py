@@ -0,0 +1,13 @@
+"""This file contains the shared base for the application's custom exceptions."""
+
+class MessageException(Exception):
+    """Base exception that carries a human-readable message."""
+
+    def __init__(self, message):
+        """Construct an exception."""
+        self.message = message
+        super().__init__(message)
+
+    def __str__(self):
+        """ToString implementation."""
+        return f"{self.message}"
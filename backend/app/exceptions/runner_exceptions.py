@@ -1,175 +1,64 @@
 """This file contains custom exceptions which may be raised during runner management process."""
+from app.exceptions.base_exceptions import MessageException
 
-class RunnerRetrievalException(Exception):
+class RunnerRetrievalException(MessageException):
     """Exception raised for an issue while retrieving a runner."""
 
-    def __init__(self, message):
-        """Construct an exception."""
-        self.message = message
-        super().__init__(message)
-
-    def __str__(self):
-        """ToString implementation."""
-        return f"{self.message})"
-
-class RunnerExecException(Exception):
+class RunnerExecException(MessageException):
     """Exception raised for an issue that prevents the normal flow of the Runner lifecycle."""
 
-    def __init__(self, message):
-        """Construct an exception."""
-        self.message = message
-        super().__init__(message)
-
-    def __str__(self):
-        """ToString implementation."""
-        return f"{self.message}"
-
-class RunnerDefinitionException(Exception):
+class RunnerDefinitionException(MessageException):
     """Exception raised for when a user has supplied an invalid runner."""
 
-    def __init__(self, message):
-        """Construct an exception."""
-        self.message = message
-        super().__init__(message)
-
-    def __str__(self):
-        """ToString implementation."""
-        return f"{self.message})"
-
-class ScriptExecutionException(Exception):
+class ScriptExecutionException(MessageException):
     """Exception raised for when a script fails to execute."""
 
-    def __init__(self, message):
-        """Construct an exception."""
-        self.message = message
-        super().__init__(message)
-
-    def __str__(self):
-        """ToString implementation."""
-        return f"{self.message})"
+class RunnerEventError(MessageException):
+    """Base exception for runner errors that are reported through the status event system."""
 
-class RunnerLaunchError(Exception):
-    """Exception raised when a runner fails to launch."""
+    # Standardized error type for the event system. Read from the class unless overridden per instance.
+    error_type = "error"
 
-    def __init__(self, message, error_type="launch_failed", details=None):
+    def __init__(self, message, error_type=None, details=None):
         """
         Construct an exception.
 
         Args:
             message: Human-readable error message
-            error_type: Standardized error type for event system
+            error_type: Standardized error type for event system, defaults to the class's error_type
             details: Additional error details for reporting
         """
-        self.message = message
-        self.error_type = error_type
-        self.details = details or {}
+        if error_type is not None:
+            self.error_type = error_type
+        self.details = details if details is not None else {}
         super().__init__(message)
 
-    def __str__(self):
-        """ToString implementation."""
-        return f"{self.message}"
-
-class RunnerClaimError(Exception):
-    """Exception raised when a runner cannot be claimed for a user."""
+class RunnerLaunchError(RunnerEventError):
+    """Exception raised when a runner fails to launch."""
 
-    def __init__(self, message, error_type="claim_failed", details=None):
-        """
-        Construct an exception.
+    error_type = "launch_failed"
 
-        Args:
-            message: Human-readable error message
-            error_type: Standardized error type for event system
-            details: Additional error details for reporting
-        """
-        self.message = message
-        self.error_type = error_type
-        self.details = details or {}
-        super().__init__(message)
+class RunnerClaimError(RunnerEventError):
+    """Exception raised when a runner cannot be claimed for a user."""
 
-    def __str__(self):
-        """ToString implementation."""
-        return f"{self.message}"
+    error_type = "claim_failed"
 
-class RunnerConnectionError(Exception):
+class RunnerConnectionError(RunnerEventError):
     """Exception raised when a connection to a runner cannot be established."""
 
-    def __init__(self, message, error_type="connection_failed", details=None):
-        """
-        Construct an exception.
+    error_type = "connection_failed"
 
-        Args:
-            message: Human-readable error message
-            error_type: Standardized error type for event system
-            details: Additional error details for reporting
-        """
-        self.message = message
-        self.error_type = error_type
-        self.details = details or {}
-        super().__init__(message)
-
-    def __str__(self):
-        """ToString implementation."""
-        return f"{self.message}"
-
-class ResourceAllocationError(Exception):
+class ResourceAllocationError(RunnerEventError):
     """Exception raised when resources cannot be allocated for a runner."""
 
-    def __init__(self, message, error_type="allocation_failed", details=None):
-        """
-        Construct an exception.
+    error_type = "allocation_failed"
 
-        Args:
-            message: Human-readable error message
-            error_type: Standardized error type for event system
-            details: Additional error details for reporting
-        """
-        self.message = message
-        self.error_type = error_type
-        self.details = details or {}
-        super().__init__(message)
-
-    def __str__(self):
-        """ToString implementation."""
-        return f"{self.message}"
-
-class SecurityConfigurationError(Exception):
+class SecurityConfigurationError(RunnerEventError):
     """Exception raised when security configuration for a runner fails."""
 
-    def __init__(self, message, error_type="security_failed", details=None):
-        """
-        Construct an exception.
+    error_type = "security_failed"
 
-        Args:
-            message: Human-readable error message
-            error_type: Standardized error type for event system
-            details: Additional error details for reporting
-        """
-        self.message = message
-        self.error_type = error_type
-        self.details = details or {}
-        super().__init__(message)
-
-    def __str__(self):
-        """ToString implementation."""
-        return f"{self.message}"
-
-class RunnerTimeoutError(Exception):
+class RunnerTimeoutError(RunnerEventError):
     """Exception raised when a runner operation times out."""
 
-    def __init__(self, message, error_type="timeout", details=None):
-        """
-        Construct an exception.
-
-        Args:
-            message: Human-readable error message
-            error_type: Standardized error type for event system
-            details: Additional error details for reporting
-        """
-        self.message = message
-        self.error_type = error_type
-        self.details = details or {}
-        super().__init__(message)
-
-    def __str__(self):
-        """ToString implementation."""
-        return f"{self.message}"
+    error_type = "timeout"
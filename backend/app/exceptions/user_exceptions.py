@@ -1,26 +1,9 @@
 """This file contains custom exceptions which may be raised during user processes."""
+from app.exceptions.base_exceptions import MessageException
 
 
-class EmailInUseException(Exception):
+class EmailInUseException(MessageException):
     """Exception raised when a new user is being created with an email already in use."""
 
-    def __init__(self, message):
-        """Construct an exception."""
-        self.message = message
-        super().__init__(message)
-
-    def __str__(self):
-        """ToString implementation."""
-        return f"{self.message})"
-
-class NoSuchRoleException(Exception):
+class NoSuchRoleException(MessageException):
     """Exception raised when a requested role is not found in the database."""
-
-    def __init__(self, message):
-        """Construct an exception."""
-        self.message = message
-        super().__init__(message)
-
-    def __str__(self):
-        """ToString implementation."""
-        return f"{self.message})"
@@ -1,6 +1,8 @@
 """Module for defining the CloudConnector model."""
 
+from functools import lru_cache
 from sqlmodel import SQLModel, Field
+from pydantic import ConfigDict
 from typing import Optional, Literal
 from app.models.mixins import TimestampMixin
 from app.business.encryption import encrypt_text, decrypt_text
@@ -10,6 +12,16 @@ from sqlalchemy import Column, String
 # Cloud connector status type
 CloudConnectorStatus = Literal["active", "inactive", "deleted"]
 
+@lru_cache(maxsize=256)
+def _decrypt_credential(encrypted_value: str) -> str:
+    """
+    Decrypt a stored credential, memoized on its ciphertext.
+
+    Keying on the ciphertext means a re-encrypted credential is simply a new entry, so nothing
+    needs invalidating when a connector's keys change.
+    """
+    return decrypt_text(encrypted_value)
+
 class CloudConnector(TimestampMixin, SQLModel, table=True):
     """
     Model representing a cloud connector with encrypted credentials.
@@ -32,7 +44,7 @@ class CloudConnector(TimestampMixin, SQLModel, table=True):
         """Return the decrypted access key."""
         if not self.encrypted_access_key:
             return ""
-        return decrypt_text(self.encrypted_access_key)
+        return _decrypt_credential(self.encrypted_access_key)
 
     def set_decrypted_access_key(self, value: str):
         """Encrypt and store the access key."""
@@ -45,7 +57,7 @@ class CloudConnector(TimestampMixin, SQLModel, table=True):
         """Return the decrypted secret key."""
         if not self.encrypted_secret_key:
             return ""
-        return decrypt_text(self.encrypted_secret_key)
+        return _decrypt_credential(self.encrypted_secret_key)
 
     def set_decrypted_secret_key(self, value: str):
         """Encrypt and store the secret key."""
@@ -54,10 +66,6 @@ class CloudConnector(TimestampMixin, SQLModel, table=True):
         else:
             self.encrypted_secret_key = ""
 
-    class Config:
-        """Pydantic model configuration."""
-
-        # Exclude these methods from serialization
-        extra = 'ignore'
-        # Ignored method fields
-        ignored_types = (property, classmethod, staticmethod)
+    # Pydantic model configuration. Extra fields are ignored and these method types are not
+    # treated as fields.
+    model_config = ConfigDict(extra="ignore", ignored_types=(property, classmethod, staticmethod))
@@ -16,7 +16,7 @@ class EndpointPermission(TimestampMixin, table=True):
     permission: str = Field(..., description="Permission required to access this endpoint")
 
     model_config: ClassVar[dict[str, Any]] = {
-        "schema_extra": {
+        "json_schema_extra": {
             "example": {
                 "resource": "cloud_connectors",
                 "endpoint": "create_cloud_connector",
@@ -1,13 +1,10 @@
 """Image model."""
 
 from __future__ import annotations
-from typing import Optional, Literal
-from datetime import datetime
-from sqlmodel import SQLModel, Field, Relationship, Column
-from sqlalchemy.orm import Mapped
+from typing import Literal
+from sqlmodel import SQLModel, Field, Column
 from sqlalchemy import JSON
 from app.models.mixins import TimestampMixin
-from app.db import database
 
 
 # Relationships
@@ -27,7 +24,6 @@ ImageStatus = Literal["creating", "active", "inactive", "deleted"]
 class Image(TimestampMixin, SQLModel, table=True):
     """Image model."""
 
-    # id: Optional[int] = Field(default=None, primary_key=True)
     id: int | None = Field(default=None, primary_key=True)
     name: str
     description: str
@@ -1,9 +1,9 @@
 """Machine model."""
 
 from __future__ import annotations
-from sqlmodel import SQLModel, Field, Session
+from sqlmodel import SQLModel, Field, Session, delete, update
 from app.models.mixins import TimestampMixin
-from app.db.database import engine
+from app.db.database import engine, SessionLocal
 
 
 # Relationships
@@ -36,19 +36,18 @@ def create_machine(machine: Machine):
     with Session(engine) as session:
         session.add(machine)
         session.commit()
-        session.refresh()
-    return machine
+        session.refresh(machine)
+        return machine
 
 def update_machine(machine: MachineUpdate):
     """Update a machine record in the database."""
-    with Session(engine) as session:
-        machine_from_db = session.get(Machine, machine.id)
-        machine_data = machine.model_dump(exclude_unset=True)
-        machine_from_db.sqlmodel_update(machine_data)
-        session.add(machine_from_db)
-        session.commit()
-        session.refresh(machine_from_db)
-        return machine_from_db
+    machine_data = machine.model_dump(exclude_unset=True, exclude={"id"})
+    with SessionLocal() as session:
+        # Apply the patch with one UPDATE rather than loading, modifying and refreshing the row
+        if machine_data:
+            session.exec(update(Machine).where(Machine.id == machine.id).values(**machine_data))
+            session.commit()
+        return session.get(Machine, machine.id)
 
 
 def get_machine(machine_id: int):
@@ -59,4 +58,5 @@ def get_machine(machine_id: int):
 def delete_machine(machine_id: int):
     """Delete a machine record from the database."""
     with Session(engine) as session:
-        session.delete(machine_id)
+        session.exec(delete(Machine).where(Machine.id == machine_id))
+        session.commit()
@@ -2,22 +2,27 @@
 """Module for defining the database model mixins."""
 
 from datetime import datetime, timezone
+from functools import partial
 from sqlmodel import SQLModel, Field
 from typing import Optional
 from sqlalchemy import Column, DateTime
 
+# Timestamp factory shared by every model row. A partial over the C-level datetime.now avoids a
+# Python frame and the timezone.utc global lookup on each call.
+utc_now = partial(datetime.now, timezone.utc)
+
 class TimestampMixin(SQLModel):
     """Mixin for adding timestamp fields to a model."""
 
     created_on: Optional[datetime] = Field(
-        default_factory=lambda: datetime.now(timezone.utc),
+        default_factory=utc_now,
         description="Database timestamp when the record was created.",
     )
     updated_on: Optional[datetime] = Field(
-        default_factory=lambda: datetime.now(timezone.utc),
+        default_factory=utc_now,
         nullable=False,
         sa_column_kwargs={
-            "onupdate": lambda: datetime.now(timezone.utc),
+            "onupdate": utc_now,
         },
     )
 
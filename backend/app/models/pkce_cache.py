@@ -1,7 +1,9 @@
 """Model for PKCE keys to cache them in the db."""
 
-from sqlmodel import Field, SQLModel, Session, Text, select, Column
-from app.db.database import engine
+import threading
+from cachetools import TTLCache
+from sqlmodel import Field, SQLModel, Session, Text, Column
+from app.db.database import engine, insert_ignoring_duplicates
 from app.models.mixins import TimestampMixin
 from app.exceptions.authentication_exceptions import NoMatchingKeyException
 
@@ -15,21 +17,39 @@ class PKCESet(TimestampMixin, SQLModel, table=True):
     key: str = Field(sa_column=Column("key", Text))
 
 
+# Key sets never change once cached under a kid, so lookups are served from memory for an hour
+_key_set_cache: TTLCache = TTLCache(maxsize=256, ttl=3600)
+_key_set_cache_lock = threading.Lock()
+
 def store_key_set(kid: str, key: str):
     """Store a key set in the cache."""
+    store_key_sets({kid: key})
+
+def store_key_sets(key_sets: dict[str, str]):
+    """Store several key sets, keyed by kid, in one statement and one commit."""
+    if not key_sets:
+        return
+    # Core inserts skip the model, so build the rows through it to pick up the timestamp defaults
+    rows = [PKCESet(kid = kid, key = key).model_dump() for kid, key in key_sets.items()]
     with Session(engine) as session:
-        record = session.exec(select(PKCESet)
-            .where(PKCESet.kid == kid))
-        if not record.first():
-            session.add(PKCESet(kid = kid, key = key))
-            session.commit()
-        session.close()
+        session.execute(insert_ignoring_duplicates(PKCESet, rows, "kid"))
+        session.commit()
+    with _key_set_cache_lock:
+        for kid in key_sets:
+            _key_set_cache.pop(kid, None)
 
 def get_key_set(kid: str):
     """Retrieve a key set from the cache."""
+    with _key_set_cache_lock:
+        key = _key_set_cache.get(kid)
+    if key is not None:
+        return key
+
     with Session(engine) as session:
-        record: PKCESet = session.exec(select(PKCESet)
-            .where(PKCESet.kid == kid)).first()
+        # kid is the primary key, so this is a primary key lookup through the identity map
+        record: PKCESet = session.get(PKCESet, kid)
         if not record:
             raise NoMatchingKeyException("Key not found in database")
-        return record.key
+    with _key_set_cache_lock:
+        _key_set_cache[kid] = record.key
+    return record.key
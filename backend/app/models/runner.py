@@ -1,13 +1,15 @@
 """Runner model."""
 
 from __future__ import annotations
+import sys
 from typing import Any
 from datetime import datetime
-from sqlmodel import SQLModel, Field, Session
-from sqlalchemy import Column, JSON
+from sqlmodel import SQLModel, Field, Session, delete, update
+from sqlalchemy import Column, JSON, Index, event
+from sqlalchemy.orm.attributes import set_committed_value
 from app.models.mixins import TimestampMixin
-from pydantic import BaseModel
-from app.db.database import engine
+from pydantic import BaseModel, ConfigDict
+from app.db.database import engine, SessionLocal
 
 # states
 # runner_starting
@@ -24,6 +26,20 @@ from app.db.database import engine
 # runner_alive states = [runner_starting, app_starting, ready, setup, awaiting_client, active, disconnecting, disconnected]
 # runner_dead states = [closed, terminated]
 
+# States in which a runner is considered alive
+ALIVE_RUNNER_STATES: frozenset[str] = frozenset({
+    "runner_starting", "app_starting", "ready", "runner_starting_claimed",
+    "ready_claimed", "setup",
+    "awaiting_client", "active", "disconnecting", "disconnected"
+})
+
+# States in which a runner has not been handed to a user (or is already gone), so the
+# on_terminate script must not run
+NO_TERMINATE_SCRIPT_STATES: frozenset[str] = frozenset({
+    "ready", "ready_claimed", "runner_starting_claimed",
+    "runner_starting", "app_starting", "terminated", "closed"
+})
+
 # Relationships
 # machine: Mapped["Machine"] = Relationship(back_populates="runners")
 # image: Mapped["Image"] = Relationship(back_populates="runners")
@@ -33,6 +49,17 @@ from app.db.database import engine
 class Runner(TimestampMixin, SQLModel, table=True):
     """Runner model for the application."""
 
+    __table_args__ = (
+        # Serves the pool claim query: filter on image and state, oldest runner first
+        Index("ix_runner_image_id_state_created_on", "image_id", "state", "created_on"),
+        # Serves state filters (alive runners, cleanup sweeps) and a user's runners in given states
+        Index("ix_runner_state_user_id", "state", "user_id"),
+        # Serves the expiry cleanup: a session_end range, with the excluded states checked in the index
+        Index("ix_runner_session_end_state", "session_end", "state"),
+        # Serves the idle pool close: ready runners not updated since the cutoff
+        Index("ix_runner_state_updated_on", "state", "updated_on"),
+    )
+
     id: int | None = Field(default=None, primary_key=True)
     machine_id: int = Field(foreign_key="machine.id")
     image_id: int = Field(foreign_key="image.id")
@@ -56,21 +83,21 @@ class Runner(TimestampMixin, SQLModel, table=True):
     @property
     def is_alive_state(self) -> bool:
         """Return True if the runner's state is considered 'alive'."""
-        alive_states = {
-            "runner_starting", "app_starting", "ready", "runner_starting_claimed",
-            "ready_claimed", "setup",
-            "awaiting_client", "active", "disconnecting", "disconnected"
-        }
-        return self.state in alive_states
+        return self.state in ALIVE_RUNNER_STATES
 
     @property
     def should_run_terminate_script(self) -> bool:
         """Return True if the runner's state is considered 'in use'."""
-        do_not_run = {
-            "ready", "ready_claimed", "runner_starting_claimed",
-            "runner_starting", "app_starting", "terminated", "closed"
-        }
-        return self.state not in do_not_run
+        return self.state not in NO_TERMINATE_SCRIPT_STATES
+
+# Runner states come from a small fixed vocabulary. Interning them as they are loaded lets the
+# frozenset membership checks above match on identity instead of comparing characters.
+@event.listens_for(Runner, "load")
+@event.listens_for(Runner, "refresh")
+def _intern_loaded_state(target: Runner, *_):
+    """Intern the state of a runner loaded from the database without marking it dirty."""
+    if isinstance(target.__dict__.get("state"), str):
+        set_committed_value(target, "state", sys.intern(target.__dict__["state"]))
 
 class RunnerResponse(BaseModel):
     """Runner response model with user email."""
@@ -101,10 +128,7 @@ class RunnerResponse(BaseModel):
     # Add user email field
     user_email: str | None = None
 
-    class Config:
-        """config for runner response model."""
-
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 class RunnerUpdate(TimestampMixin, SQLModel):
     """Runner update model."""
@@ -121,22 +145,20 @@ class RunnerUpdate(TimestampMixin, SQLModel):
 
 def create_runner(runner: Runner):
     """Create a runner record in the database."""
-    with Session(engine) as session:
+    with SessionLocal() as session:
         session.add(runner)
         session.commit()
-        session.refresh()
-    return runner
+        return runner
 
 def update_runner(runner: RunnerUpdate):
     """Update a runner record in the database."""
-    with Session(engine) as session:
-        runner_from_db = session.get(Runner, runner.id)
-        runner_data = runner.model_dump(exclude_unset=True)
-        runner_from_db.sqlmodel_update(runner_data)
-        session.add(runner_from_db)
-        session.commit()
-        session.refresh(runner_from_db)
-        return runner_from_db
+    runner_data = runner.model_dump(exclude_unset=True, exclude={"id"})
+    with SessionLocal() as session:
+        # Apply the patch with one UPDATE rather than loading, modifying and refreshing the row
+        if runner_data:
+            session.exec(update(Runner).where(Runner.id == runner.id).values(**runner_data))
+            session.commit()
+        return session.get(Runner, runner.id)
 
 
 def get_runner(runner_id: int):
@@ -147,5 +169,5 @@ def get_runner(runner_id: int):
 def delete_runner(runner_id: int):
     """Delete a runner record from the database."""
     with Session(engine) as session:
-        session.delete(runner_id)
+        session.exec(delete(Runner).where(Runner.id == runner_id))
         session.commit()
@@ -23,7 +23,7 @@ class User(TimestampMixin, SQLModel, table=True):
     id: int | None = Field(default=None, primary_key=True)
     first_name: str
     last_name: str
-    email: str
+    email: str = Field(index=True)
     workos_id: str | None = None
     status: str = Field(default="active")
 
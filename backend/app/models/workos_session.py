@@ -1,8 +1,8 @@
 """Model for workOS sessions, tracks access and refresh tokens."""
-from sqlmodel import Field, SQLModel, Session, Text, select, Column, String
-from app.business.encryption import decrypt_text, encrypt_text
+from sqlmodel import Field, SQLModel, Text, select, update, Column, String
+from app.business.encryption import decrypt_text, encrypt_text, digest_text
 from app.models.mixins import TimestampMixin
-from app.db.database import engine
+from app.db.database import SessionLocal
 from app.exceptions.authentication_exceptions import NoRefreshSessionFound
 
 class WorkosSession(TimestampMixin, SQLModel, table=True):
@@ -15,7 +15,11 @@ class WorkosSession(TimestampMixin, SQLModel, table=True):
     ip_address: str
     user_agent: str
     encrypted_refresh_token: str = Field(sa_column=Column("refresh_token", Text))
-    encrypted_access_token: str = Field(sa_column=Column( "access_token", Text)) #Need to index, can't use index=true with sa_column
+    encrypted_access_token: str = Field(sa_column=Column( "access_token", Text))
+    # SHA-256 hex digest of the access token, NULL when there is none. Sessions are looked up by
+    # this short uniquely indexed column instead of by the TEXT ciphertext, which MySQL can only
+    # prefix-index.
+    access_token_lookup: str | None = Field(default=None, sa_column=Column("access_token_lookup", String(64), index=True, unique=True))
 
 
     def get_decrypted_refresh_token(self) -> str:
@@ -41,23 +45,28 @@ class WorkosSession(TimestampMixin, SQLModel, table=True):
         """Encrypt and store the authentication token."""
         if value:
             self.encrypted_access_token = encrypt_text(value)
+            self.access_token_lookup = digest_text(value)
         else:
             self.encrypted_access_token = ""
+            self.access_token_lookup = None
 
 
 def create_workos_session(workos_session: WorkosSession):
     """Create a workos_session record in the database."""
-    with Session(engine) as database_session:
+    with SessionLocal() as database_session:
         database_session.add(workos_session)
         database_session.commit()
 
 
 def get_refresh_token(access_token: str):
     """Return a refresh token for an access token."""
-    with Session(engine) as database_session:
-        encrypted_access_token = encrypt_text(access_token)
+    return get_refresh_token_by_digest(digest_text(access_token))
+
+def get_refresh_token_by_digest(access_token_digest: str):
+    """Return a refresh token for an access token, given its digest."""
+    with SessionLocal() as database_session:
         record: WorkosSession = database_session.exec(select(WorkosSession)
-            .where(WorkosSession.encrypted_access_token == encrypt_text(access_token))).first()
+            .where(WorkosSession.access_token_lookup == access_token_digest)).first()
         if not record:
             raise Exception("Session not found")
         return record.get_decrypted_refresh_token()
@@ -66,12 +75,21 @@ def get_refresh_token(access_token: str):
 
 def refresh_session(old_access_token: str, access_token: str, refresh_token: str):
     """Update a session with new access and refresh tokens."""
-    with Session(engine) as database_session:
-        record: WorkosSession = database_session.exec(select(WorkosSession)
-            .where(WorkosSession.encrypted_access_token == encrypt_text(old_access_token))).first()
-        if not record:
+    refresh_session_by_digest(digest_text(old_access_token), access_token, refresh_token)
+
+def refresh_session_by_digest(old_access_token_digest: str, access_token: str, refresh_token: str):
+    """Update a session, found by its access token digest, with new access and refresh tokens."""
+    # Rotate both tokens with a single UPDATE instead of loading the record first.
+    # MySQL has no UPDATE ... RETURNING, so the matched row count tells us whether the session exists.
+    with SessionLocal() as database_session:
+        result = database_session.exec(update(WorkosSession)
+            .where(WorkosSession.access_token_lookup == old_access_token_digest)
+            .values(
+                encrypted_access_token=encrypt_text(access_token) if access_token else "",
+                access_token_lookup=digest_text(access_token) if access_token else None,
+                encrypted_refresh_token=encrypt_text(refresh_token) if refresh_token else ""
+            ))
+        if result.rowcount == 0:
+            database_session.rollback()
             raise NoRefreshSessionFound("Session not found")
-        record.set_decrypted_access_token(access_token)
-        record.set_decrypted_refresh_token(refresh_token)
-        database_session.add(record)
         database_session.commit()
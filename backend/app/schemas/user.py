@@ -1,10 +1,25 @@
 """User schema."""
-from pydantic import BaseModel, EmailStr
+import re
+from pydantic import BaseModel, field_validator
+
+# Structural email check: one @, no whitespace, a dot in the domain. WorkOS validates the address
+# again when the user is created there. Use fullmatch: a trailing "$" would also accept a final newline.
+EMAIL_PATTERN = re.compile(r"[^@\s]+@[^@\s]+\.[^@\s]+")
 
 class UserCreate(BaseModel):
     """User create model."""
 
     first_name: str
     last_name: str
-    email: EmailStr
+    email: str
     password: str
+
+    @field_validator("email")
+    @classmethod
+    def validate_email(cls, email: str) -> str:
+        """Check the email's shape and lowercase its domain, as EmailStr normalization did."""
+        email = email.strip()
+        if not EMAIL_PATTERN.fullmatch(email):
+            raise ValueError("value is not a valid email address")
+        local_part, _, domain = email.rpartition("@")
+        return f"{local_part}@{domain.lower()}"
@@ -1,133 +1,241 @@
 # app/tasks/cleanup_runners.py
 """Cleanup task for active runners whose session_end has passed."""
 
-from datetime import datetime
-from sqlmodel import Session, select
+import time
+from datetime import datetime, timezone
+from sqlmodel import Session, select, update
 from celery.utils.log import get_task_logger
 from app.celery_app import celery_app
-from app.db.database import engine
+from app.db.database import SessionLocal
 from app.models.runner import Runner
 from app.models.runner_history import RunnerHistory
 from app.models.image import Image
 from app.models.cloud_connector import CloudConnector
-from app.business.cloud_services.cloud_service_factory import get_cloud_service
-from sqlalchemy import not_
+from app.business import runner_management
+from app.util.async_loop import run_pool_coroutine
+from sqlalchemy import Row, not_
 import asyncio
+import os
 
 logger = get_task_logger(__name__)
 
+# Upper bound on runners terminated at the same time, keeps a large backlog from running into
+# cloud API throttling
+CLEANUP_TERMINATE_CONCURRENCY = int(os.getenv("CLEANUP_CONCURRENCY", "32"))
+
+# Number of expired runners read and processed per batch
+CLEANUP_BATCH_SIZE = 500
+
+async def terminate_expired_runners(runner_ids: list[int], initiated_by: str) -> list:
+    """
+    Terminate several runners concurrently.
+
+    Returns one entry per runner id, in order: the terminate_runner result, or the exception
+    raised for that runner.
+    """
+    semaphore = asyncio.Semaphore(CLEANUP_TERMINATE_CONCURRENCY)
+
+    async def terminate(runner_id: int):
+        async with semaphore:
+            return await runner_management.terminate_runner(runner_id, initiated_by=initiated_by)
+
+    return await asyncio.gather(*(terminate(runner_id) for runner_id in runner_ids), return_exceptions=True)
+
+def as_utc(value: datetime) -> datetime:
+    """Return the datetime as UTC aware. MySQL DATETIME columns load naive values that hold UTC."""
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
+def mark_runners_error(session: Session, failures: list[tuple[Row, Exception]], now: datetime, cleanup_run_id: str):
+    """
+    Move runners that failed cleanup to the error state so they are not retried forever.
+
+    All runners are updated with one UPDATE and their history records are committed together.
+    """
+    if not failures:
+        return
+    now_iso = now.isoformat()
+    try:
+        # Create a runner history record for each error
+        history_records = [
+            RunnerHistory(
+                runner_id=runner.id,
+                event_name="runner_cleanup_error",
+                event_data={
+                    "previous_state": runner.state,
+                    "new_state": "error",
+                    "error_time": now_iso,
+                    "error": str(error),
+                    "cleanup_job_id": cleanup_run_id
+                },
+                created_by="system",
+                modified_by="system"
+            )
+            for runner, error in failures
+        ]
+        session.exec(
+            update(Runner)
+            .where(Runner.id.in_([runner.id for runner, _ in failures]))
+            .values(state="error", ended_on=now)
+        )
+        session.add_all(history_records)
+        session.commit()
+    except Exception as inner_e:
+        session.rollback()
+        logger.error(f"[{cleanup_run_id}] Error updating state of runners "
+                     f"{[runner.id for runner, _ in failures]}: {inner_e!s}")
+
+def cleanup_runner_batch(session: Session, results: list[Row], now: datetime, cleanup_run_id: str) -> tuple[int, int]:
+    """
+    Record the expiry of a batch of runners, terminate them and mark the ones that failed.
+
+    Returns the number of successful and failed terminations.
+    """
+    count_success = 0
+    count_error = 0
+
+    # Record the expiry of every runner that can be terminated, then terminate them together
+    expired_runners = []
+    expiry_records = []
+    # Runners that failed, moved to the error state together once the batch is done
+    failures: list[tuple[Row, Exception]] = []
+    now_iso = now.isoformat()
+    for runner in results:
+        logger.info(f"[{cleanup_run_id}] Processing expired runner {runner.id} (instance {runner.identifier})")
+
+        try:
+            if runner.image_id is None:
+                logger.error(f"[{cleanup_run_id}] Image not found for runner {runner.id}")
+                count_error += 1
+                continue
+
+            if runner.cloud_connector_id is None:
+                logger.error(f"[{cleanup_run_id}] Cloud connector not found for image {runner.image_id}")
+                count_error += 1
+                continue
+
+            # Add a specific history record for this runner before termination to show it was expired
+            session_end = runner.session_end
+            expiry_record = RunnerHistory(
+                runner_id=runner.id,
+                event_name="runner_expired",
+                event_data={
+                    "timestamp": now_iso,
+                    "session_end": session_end.isoformat() if session_end else None,
+                    "current_state": runner.state,
+                    "cleanup_job_id": cleanup_run_id,
+                    "minutes_expired": round((now - as_utc(session_end)).total_seconds() / 60, 2) if session_end else None
+                },
+                created_by="system",
+                modified_by="system"
+            )
+            expiry_records.append(expiry_record)
+            expired_runners.append(runner)
+
+        except Exception as e:
+            logger.error(f"[{cleanup_run_id}] Error processing runner {runner.id}: {e!s}")
+            count_error += 1
+            failures.append((runner, e))
+
+    # Insert all expiry records with one commit, still before any runner is terminated
+    if expiry_records:
+        try:
+            session.add_all(expiry_records)
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            logger.error(f"[{cleanup_run_id}] Error recording runner expiries: {e!s}")
+            for runner in expired_runners:
+                count_error += 1
+                failures.append((runner, e))
+            expired_runners = []
+
+    # Terminations wait on the cloud API, so they run concurrently
+    # Pass the cleanup job ID as the initiator
+    runner_ids = [runner.id for runner in expired_runners]
+    # Every batch runs on the same cached event loop instead of creating a new one
+    termination_results = run_pool_coroutine(terminate_expired_runners(runner_ids, initiated_by=cleanup_run_id)) if runner_ids else []
+
+    for runner_id, runner, result in zip(runner_ids, expired_runners, termination_results, strict=True):
+        if isinstance(result, Exception):
+            logger.error(f"[{cleanup_run_id}] Error processing runner {runner_id}: {result!s}")
+            count_error += 1
+            failures.append((runner, result))
+        elif result["status"] == "success":
+            logger.info(f"[{cleanup_run_id}] Successfully terminated runner {runner_id}")
+            count_success += 1
+        else:
+            logger.error(f"[{cleanup_run_id}] Failed to terminate runner {runner_id}: {result['message']}")
+            count_error += 1
+
+    mark_runners_error(session, failures, now, cleanup_run_id)
+    return count_success, count_error
+
 @celery_app.task
 def cleanup_active_runners():
     """Task to cleanup active runners whose session_end has passed."""
-    now = datetime.utcnow()
+    # Wall clock time for comparisons and records, monotonic clock for the run's duration
+    now = datetime.now(timezone.utc)
+    started = time.monotonic()
 
     # Identifier for this specific cleanup run
     cleanup_run_id = f"cleanup_job_{now.strftime('%Y%m%d_%H%M%S')}"
 
     logger.info(f"[{cleanup_run_id}] Starting cleanup of active runners whose session_end has passed")
 
-    with Session(engine) as session:
-        # Query all runners that are active and whose session_end is in the past
-        results = session.exec(
-            select(Runner).where(
-                ~Runner.state.in_(["terminated", "ready", "closed", "closed_pool"]),
-                Runner.session_end < now
-            )
-        ).all()
-
-        # Log summary of found expired runners
-        logger.info(f"[{cleanup_run_id}] Found {len(results)} expired runners to terminate")
-
-        count_success = 0
-        count_error = 0
-
-        for runner in results:
-            logger.info(f"[{cleanup_run_id}] Processing expired runner {runner.id} (instance {runner.identifier})")
-
-            try:
-                # Get the image and cloud connector
-                image = session.get(Image, runner.image_id)
-                if not image:
-                    logger.error(f"[{cleanup_run_id}] Image not found for runner {runner.id}")
-                    count_error += 1
-                    continue
-
-                cloud_connector = session.get(CloudConnector, image.cloud_connector_id)
-                if not cloud_connector:
-                    logger.error(f"[{cleanup_run_id}] Cloud connector not found for image {image.id}")
-                    count_error += 1
-                    continue
-
-                # Add a specific history record for this runner before termination to show it was expired
-                expiry_record = RunnerHistory(
-                    runner_id=runner.id,
-                    event_name="runner_expired",
-                    event_data={
-                        "timestamp": now.isoformat(),
-                        "session_end": runner.session_end.isoformat() if runner.session_end else None,
-                        "current_state": runner.state,
-                        "cleanup_job_id": cleanup_run_id,
-                        "minutes_expired": round((now - runner.session_end).total_seconds() / 60, 2) if runner.session_end else None
-                    },
-                    created_by="system",
-                    modified_by="system"
-                )
-                session.add(expiry_record)
-                session.commit()
-
-                # Call the terminate_runner function with the cleanup job identifier
-                from app.business.runner_management import terminate_runner
-
-                # Use asyncio.run to execute the async terminate_runner function
-                # Pass the cleanup job ID as the initiator
-                result = asyncio.run(terminate_runner(runner.id, initiated_by=cleanup_run_id))
-
-                if result["status"] == "success":
-                    logger.info(f"[{cleanup_run_id}] Successfully terminated runner {runner.id}")
-                    count_success += 1
-                else:
-                    logger.error(f"[{cleanup_run_id}] Failed to terminate runner {runner.id}: {result['message']}")
-                    count_error += 1
-
-            except Exception as e:
-                logger.error(f"[{cleanup_run_id}] Error processing runner {runner.id}: {e!s}")
-                count_error += 1
-
-                # Try to update the runner state anyway to prevent retrying forever
-                try:
-                    runner.state = "error"
-                    runner.ended_on = now
-                    session.add(runner)
-
-                    # Create a runner history record for the error
-                    event_data = {
-                        "previous_state": runner.state,
-                        "new_state": "error",
-                        "error_time": now.isoformat(),
-                        "error": str(e),
-                        "cleanup_job_id": cleanup_run_id
-                    }
-                    history_record = RunnerHistory(
-                        runner_id=runner.id,
-                        event_name="runner_cleanup_error",
-                        event_data=event_data,
-                        created_by="system",
-                        modified_by="system"
-                    )
-                    session.add(history_record)
-                    session.commit()
-                except Exception as inner_e:
-                    logger.error(f"[{cleanup_run_id}] Error updating runner {runner.id} state: {inner_e!s}")
+    # Query all runners that are active and whose session_end is in the past, together with the
+    # ids of their image and cloud connector. Outer joins keep runners whose image or connector
+    # is gone. Only the columns the cleanup reads are loaded, not whole rows with their JSON.
+    expired_runners_query = (
+        select(
+            Runner.id, Runner.identifier, Runner.state, Runner.session_end,
+            Image.id.label("image_id"), CloudConnector.id.label("cloud_connector_id")
+        )
+        .outerjoin(Image, Image.id == Runner.image_id)
+        .outerjoin(CloudConnector, CloudConnector.id == Image.cloud_connector_id)
+        .where(
+            ~Runner.state.in_(["terminated", "ready", "closed", "closed_pool"]),
+            Runner.session_end < now
+        )
+        .order_by(Runner.id)
+        .limit(CLEANUP_BATCH_SIZE)
+    )
+
+    found_expired = 0
+    count_success = 0
+    count_error = 0
+
+    with SessionLocal() as session:
+        # Work through the backlog in batches, resuming after the last runner id of the previous
+        # batch, so memory stays bounded and terminations start before the whole set is read.
+        # Keyset pages are used rather than a streamed cursor because MySQL cannot run the batch's
+        # writes on a connection that is still streaming a result.
+        last_runner_id = 0
+        while True:
+            results = session.exec(expired_runners_query.where(Runner.id > last_runner_id)).all()
+            if not results:
+                break
+            last_runner_id = results[-1].id
+            found_expired += len(results)
+
+            # Log summary of found expired runners
+            logger.info(f"[{cleanup_run_id}] Found {len(results)} expired runners to terminate in this batch")
+
+            batch_success, batch_error = cleanup_runner_batch(session, results, now, cleanup_run_id)
+            count_success += batch_success
+            count_error += batch_error
+
+            if len(results) < CLEANUP_BATCH_SIZE:
+                break
 
     # Log the final summary instead of creating a system-level record
-    duration_seconds = (datetime.utcnow() - now).total_seconds()
-    logger.info(f"[{cleanup_run_id}] Cleanup complete. Successfully terminated: {count_success}, Errors: {count_error}, "
-                f"Duration: {duration_seconds:.2f} seconds")
+    duration_seconds = time.monotonic() - started
+    logger.info(f"[{cleanup_run_id}] Cleanup complete. Found: {found_expired}, Successfully terminated: {count_success}, "
+                f"Errors: {count_error}, Duration: {duration_seconds:.2f} seconds")
 
     # Return a summary dictionary for Celery task results
     return {
         "cleanup_job_id": cleanup_run_id,
-        "found_expired": len(results),
+        "found_expired": found_expired,
         "successful_terminations": count_success,
         "failed_terminations": count_error,
         "duration_seconds": duration_seconds
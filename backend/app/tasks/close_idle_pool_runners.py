@@ -1,7 +1,7 @@
 """Task to close idle ready pool runners before pool management runs."""
 from datetime import datetime, timedelta
-from sqlmodel import Session, select
-from app.db.database import engine
+from sqlmodel import select
+from app.db.database import SessionLocal
 from app.models.runner import Runner
 from app.models.runner_history import RunnerHistory
 from celery.utils.log import get_task_logger
@@ -19,7 +19,7 @@ def close_idle_pool_runners():
     now = datetime.utcnow()
     idle_cutoff = now - timedelta(minutes=IDLE_POOL_RUNNER_MINUTES)
     closed_count = 0
-    with Session(engine) as session:
+    with SessionLocal() as session:
         stmt = select(Runner).where(
             Runner.state == "ready",
             Runner.updated_on is not None,
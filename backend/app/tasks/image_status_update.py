@@ -6,7 +6,7 @@ from app.db.database import engine
 from app.models import Image
 from app.db import image_repository, cloud_connector_repository
 from app.business import cloud_services
-import asyncio
+from app.util.async_loop import run_pool_coroutine
 
 @shared_task(bind=True)
 def update_image_status_task(self, image_id: int, image_identifier: str, cloud_connector_id: int):
@@ -25,7 +25,7 @@ def update_image_status_task(self, image_id: int, image_identifier: str, cloud_c
 
     try:
         # Get the cloud connector
-        cloud_connector = cloud_connector_repository.find_cloud_connector_by_id(
+        cloud_connector = cloud_connector_repository.get_cached_cloud_connector(
             cloud_connector_id
         )
         if not cloud_connector:
@@ -46,16 +46,12 @@ def update_image_status_task(self, image_id: int, image_identifier: str, cloud_c
         cloud_service = cloud_services.cloud_service_factory.get_cloud_service(cloud_connector)
 
         try:
-            # Create a new event loop for this task
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-
             # The wait_for_image_available method now handles retries internally
-            # No need for Celery to retry, as the method will retry up to 5 times
-            image_available = loop.run_until_complete(
+            # No need for Celery to retry, as the method will retry up to 5 times.
+            # Runs on the worker's shared event loop rather than a new loop per check.
+            image_available = run_pool_coroutine(
                 cloud_service.wait_for_image_available(image_identifier)
             )
-            loop.close()
 
             # If we get here, the image is available, so update the status
             with Session(engine) as session:
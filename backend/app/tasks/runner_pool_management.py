@@ -1,19 +1,83 @@
 """Runner pool management task."""
 
 from datetime import datetime
-from sqlmodel import Session, select
+from sqlmodel import Session, select, insert
 from app.celery_app import celery_app
 from app.db.database import engine
 from app.models.runner import Runner
 from app.models.image import Image
 from app.models.cloud_connector import CloudConnector
 from app.models.runner_history import RunnerHistory
+from app.models.mixins import utc_now
+from app.util.async_loop import run_pool_coroutine
 from sqlalchemy import func
 from celery.utils.log import get_task_logger
 import asyncio
 
 logger = get_task_logger(__name__)
 
+# Upper bound on images whose runners are launched at the same time, keeps cloud API calls in check
+POOL_LAUNCH_CONCURRENCY = 8
+
+async def launch_pool_runners(launches: list[tuple[str, int, int]], initiated_by: str) -> list:
+    """
+    Launch runners for several images concurrently.
+
+    Args:
+        launches: (image_identifier, runner_count, cloud_connector_id) for each image to scale up
+        initiated_by: Identifier of the job that initiated the launch
+
+    Returns:
+        One entry per launch, in order: the launched runners, or the exception raised for that image.
+    """
+    from app.business.runner_management import launch_runners
+    from app.business.key_management import get_daily_key
+
+    # Create today's key per cloud connector up front so concurrent launches don't race to create it
+    for cloud_connector_id in {cloud_connector_id for _, _, cloud_connector_id in launches}:
+        try:
+            await get_daily_key(cloud_connector_id=cloud_connector_id)
+        except Exception as e:
+            logger.error(f"[{initiated_by}] Error getting daily key for cloud connector {cloud_connector_id}: {e!s}")
+
+    semaphore = asyncio.Semaphore(POOL_LAUNCH_CONCURRENCY)
+
+    async def launch(image_identifier: str, runner_count: int):
+        async with semaphore:
+            return await launch_runners(image_identifier, runner_count, initiated_by=initiated_by)
+
+    return await asyncio.gather(
+        *(launch(image_identifier, runner_count) for image_identifier, runner_count, _ in launches),
+        return_exceptions=True
+    )
+
+async def scale_runner_pool(launches: list[tuple[str, int, int]], shutdowns: list[list[str]],
+                            initiated_by: str) -> tuple[list, list]:
+    """
+    Launch and shut down the runners of every image concurrently, on one event loop.
+
+    Args:
+        launches: (image_identifier, runner_count, cloud_connector_id) for each image to scale up
+        shutdowns: Instance ids to terminate for each image to scale down
+        initiated_by: Identifier of the job that initiated the scaling
+
+    Returns:
+        The launch results and the shutdown results, each with one entry per image, in order: the
+        result of that image's launch or shutdown, or the exception raised for it.
+    """
+    from app.business.runner_management import shutdown_runners
+
+    async def shutdown_all() -> list:
+        return await asyncio.gather(
+            *(shutdown_runners(instance_ids, initiated_by) for instance_ids in shutdowns),
+            return_exceptions=True
+        )
+
+    launch_results, shutdown_results = await asyncio.gather(
+        launch_pool_runners(launches, initiated_by), shutdown_all()
+    )
+    return launch_results, shutdown_results
+
 @celery_app.task
 def manage_runner_pool():
     """
@@ -39,15 +103,28 @@ def manage_runner_pool():
         "image_stats": []
     }
 
+    # Scale-ups and scale-downs are collected while scanning the images and run together afterwards
+    pending_launches: list[tuple[dict, int, str, int]] = []
+    pending_shutdowns: list[tuple[dict, int, list[str]]] = []
+
     with Session(engine) as session:
-        # 1) Fetch all images and their configured runner_pool_size, along with their cloud connectors
-        stmt_images = select(Image, CloudConnector).join(
+        # 1) Fetch the id, identifier and configured runner_pool_size of every image with a cloud connector.
+        # Only these columns are read, so project them instead of hydrating whole Image/CloudConnector rows.
+        stmt_images = select(
+            Image.id, Image.identifier, Image.runner_pool_size, Image.cloud_connector_id
+        ).join(
             CloudConnector, Image.cloud_connector_id == CloudConnector.id
         )
 
         image_results = session.exec(stmt_images).all()
 
-        for image, cloud_connector in image_results:
+        # 2) Count the ready, starting and closed pool runners of every image with one grouped query
+        stmt_pool_counts = select(Runner.image_id, Runner.state, func.count()).where(
+            Runner.state.in_(["ready", "runner_starting", "closed_pool"])
+        ).group_by(Runner.image_id, Runner.state)
+        pool_counts = {(image_id, state): count for image_id, state, count in session.exec(stmt_pool_counts)}
+
+        for image in image_results:
             image_stat = {
                 "image_id": image.id,
                 "image_identifier": image.identifier,
@@ -59,24 +136,19 @@ def manage_runner_pool():
                 "error": None
             }
 
-            # 2) Get the current number of "ready" runners for the image
-            stmt_ready_runners = select(Runner).where(Runner.state == "ready", Runner.image_id == image.id)
-            stmt_runner_starting_runners = select(Runner).where(Runner.state == "runner_starting", Runner.image_id == image.id)
-            stmt_closed_runners = select(Runner).where(Runner.state == "closed_pool", Runner.image_id == image.id)
-            ready_runners = session.exec(stmt_ready_runners).all()
-            starting_runners = session.exec(stmt_runner_starting_runners).all()
-            closed_runners = session.exec(stmt_closed_runners).all()
-            ready_runners_count = len(ready_runners) + len(starting_runners) + len(closed_runners)
+            # Current number of "ready" runners for the image
+            ready_runners_count = (pool_counts.get((image.id, "ready"), 0)
+                                   + pool_counts.get((image.id, "runner_starting"), 0)
+                                   + pool_counts.get((image.id, "closed_pool"), 0))
 
             image_stat["ready_runners_before"] = ready_runners_count
 
             # 3) Compare the ready runner count with the pool size
             if ready_runners_count < image.runner_pool_size:
-                from app.business.runner_management import launch_runners
                 # If there are fewer ready runners than required, launch new ones
                 runners_to_create = image.runner_pool_size - ready_runners_count
                 logger.info(f"[{pool_run_id}] Launching {runners_to_create} new runners for image {image.id} ({image.identifier})")
-                logger.info(f"[{pool_run_id}] Using cloud connector {cloud_connector.id}")
+                logger.info(f"[{pool_run_id}] Using cloud connector {image.cloud_connector_id}")
 
                 # Log scaling decision instead of creating system-level record
                 logger.info(f"[{pool_run_id}] Scaling up image {image.id}: current={ready_runners_count}, " +
@@ -84,24 +156,9 @@ def manage_runner_pool():
 
                 image_stat["action_taken"] = "scale_up"
                 image_stat["runners_to_create"] = runners_to_create
-
-                try:
-                    # Launch the new runners with the pool run ID as the initiator
-                    instances = asyncio.run(launch_runners(image.identifier, runners_to_create, initiated_by=pool_run_id))
-
-                    # Log success instead of creating system-level record
-                    logger.info(f"[{pool_run_id}] Successfully launched {len(instances)} instances for image {image.id}")
-
-                    stats["runners_launched"] += len(instances)
-                    image_stat["runners_created"] = len(instances)
-
-                except Exception as e:
-                    logger.error(f"[{pool_run_id}] Error launching runners for image {image.id}: {e!s}")
-                    stats["errors"] += 1
-                    image_stat["error"] = str(e)
+                pending_launches.append((image_stat, image.id, image.identifier, image.cloud_connector_id))
 
             elif ready_runners_count > image.runner_pool_size:
-                from app.business.runner_management import shutdown_runners
                 # If there are excess ready runners, terminate the extra ones
                 runners_to_terminate = ready_runners_count - image.runner_pool_size
                 logger.info(f"[{pool_run_id}] Terminating {runners_to_terminate} extra runners for image {image.id} ({image.identifier})")
@@ -123,46 +180,75 @@ def manage_runner_pool():
 
                 # Add individual runner history records for each runner being terminated
                 # Keep these because they're runner-specific (not system-level)
+                # Inserted with one multi-row INSERT, so the timestamps the model would default are set here
+                recorded_on = utc_now()
+                pool_terminate_records = []
                 for runner in excess_runners:
                     logger.info(f"[{pool_run_id}] Marking runner {runner.id} for termination (excess pool capacity)")
 
-                    pool_terminate_record = RunnerHistory(
-                        runner_id=runner.id,
-                        event_name="pool_terminating_runner",
-                        event_data={
+                    pool_terminate_records.append({
+                        "runner_id": runner.id,
+                        "event_name": "pool_terminating_runner",
+                        "event_data": {
                             "timestamp": now.isoformat(),
                             "reason": "excess_pool_capacity",
                             "image_id": image.id,
                             "age_seconds": (now - runner.created_on).total_seconds() if runner.created_on else None,
                             "job_id": pool_run_id
                         },
-                        created_by="system",
-                        modified_by="system"
-                    )
-                    session.add(pool_terminate_record)
-                session.commit()
-
-                # Terminate the extra runners
+                        "created_on": recorded_on,
+                        "updated_on": recorded_on,
+                        "created_by": "system",
+                        "modified_by": "system"
+                    })
+                if pool_terminate_records:
+                    session.exec(insert(RunnerHistory).values(pool_terminate_records))
+                    session.commit()
+
+                # Terminate the extra runners once every image has been scanned
                 instance_ids_to_terminate = [runner.identifier for runner in excess_runners]
-                try:
-                    # Use the pool_run_id as the initiator for the termination
-                    termination_results = asyncio.run(shutdown_runners(instance_ids_to_terminate, pool_run_id))
-
-                    # Log success instead of creating system-level record
-                    logger.info(f"[{pool_run_id}] Successfully started termination for {len(instance_ids_to_terminate)}")
-                    logger.info(f"[{pool_run_id}] For image {image.id}, terminated instances: {termination_results}")
-
-                    stats["runners_terminated"] += len(instance_ids_to_terminate)
-                    image_stat["runners_terminated"] = len(instance_ids_to_terminate)
-
-                except Exception as e:
-                    logger.error(f"[{pool_run_id}] Error terminating runners for image {image.id}: {e!s}")
-                    stats["errors"] += 1
-                    image_stat["error"] = str(e)
+                pending_shutdowns.append((image_stat, image.id, instance_ids_to_terminate))
 
             stats["images_processed"] += 1
             stats["image_stats"].append(image_stat)
 
+    # 4) Launch the new runners and terminate the extra ones for every image concurrently, with
+    # the pool run ID as the initiator
+    if pending_launches or pending_shutdowns:
+        launch_results, shutdown_results = run_pool_coroutine(scale_runner_pool(
+            [(image_identifier, image_stat["runners_to_create"], cloud_connector_id)
+             for image_stat, _, image_identifier, cloud_connector_id in pending_launches],
+            [instance_ids for _, _, instance_ids in pending_shutdowns],
+            initiated_by=pool_run_id
+        ))
+
+        for (image_stat, image_id, _, _), result in zip(pending_launches, launch_results, strict=True):
+            if isinstance(result, Exception):
+                logger.error(f"[{pool_run_id}] Error launching runners for image {image_id}: {result!s}")
+                stats["errors"] += 1
+                image_stat["error"] = str(result)
+                continue
+
+            # Log success instead of creating system-level record
+            logger.info(f"[{pool_run_id}] Successfully launched {len(result)} instances for image {image_id}")
+
+            stats["runners_launched"] += len(result)
+            image_stat["runners_created"] = len(result)
+
+        for (image_stat, image_id, instance_ids), result in zip(pending_shutdowns, shutdown_results, strict=True):
+            if isinstance(result, Exception):
+                logger.error(f"[{pool_run_id}] Error terminating runners for image {image_id}: {result!s}")
+                stats["errors"] += 1
+                image_stat["error"] = str(result)
+                continue
+
+            # Log success instead of creating system-level record
+            logger.info(f"[{pool_run_id}] Successfully started termination for {len(instance_ids)}")
+            logger.info(f"[{pool_run_id}] For image {image_id}, terminated instances: {result}")
+
+            stats["runners_terminated"] += len(instance_ids)
+            image_stat["runners_terminated"] = len(instance_ids)
+
     # Add completion information to the stats
     stats["duration_seconds"] = (datetime.utcnow() - now).total_seconds()
     stats["completion_time"] = datetime.utcnow().isoformat()
@@ -49,7 +49,7 @@ def validate_and_prepare_runner(runner_id, instance_id, initiated_by, result):
             result["details"].append({"step": "find_image", "status": "error", "message": message})
             return False, None
 
-        cloud_connector = cloud_connector_repository.find_cloud_connector_by_id(image.cloud_connector_id)
+        cloud_connector = cloud_connector_repository.get_cached_cloud_connector(image.cloud_connector_id)
         if not cloud_connector:
             message = f"Cloud connector for image {image.id} not found."
             logger.error(f"[{initiated_by}] {message}")
@@ -210,7 +210,7 @@ def stop_instance(resources, initiated_by, result):
     """Stop the cloud instance and update runner state to 'closed'."""
     try:
         # Get a fresh cloud service
-        cloud_connector = cloud_connector_repository.find_cloud_connector_by_id(
+        cloud_connector = cloud_connector_repository.get_cached_cloud_connector(
             resources["cloud_connector_id"]
         )
         if not cloud_connector:
@@ -267,7 +267,7 @@ def terminate_instance(resources, initiated_by, result, task=None):
     """Terminate the cloud instance and update runner state to 'terminated'."""
     try:
         # Get a fresh cloud service for termination
-        cloud_connector = cloud_connector_repository.find_cloud_connector_by_id(
+        cloud_connector = cloud_connector_repository.get_cached_cloud_connector(
             resources["cloud_connector_id"]
         )
         if not cloud_connector:
@@ -503,7 +503,7 @@ def cleanup_security_groups(resources, initiated_by, result):
         logger.info(f"[{initiated_by}] Cleaning up security groups for runner {resources['runner'].id}")
 
         # Get a fresh cloud service
-        cloud_connector = cloud_connector_repository.find_cloud_connector_by_id(
+        cloud_connector = cloud_connector_repository.get_cached_cloud_connector(
             resources["cloud_connector_id"]
         )
         if not cloud_connector:
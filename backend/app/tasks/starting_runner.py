@@ -33,7 +33,7 @@ def wait_for_instance_running(runner_id: int, instance_id: str):
                 logger.error(f"Image not found for runner {runner_id}.")
                 return
 
-            cloud_connector = cloud_connector_repository.find_cloud_connector_by_id(image.cloud_connector_id)
+            cloud_connector = cloud_connector_repository.get_cached_cloud_connector(image.cloud_connector_id)
             if not cloud_connector:
                 logger.error(f"Cloud connector not found for image {image.id}.")
                 return
@@ -100,7 +100,7 @@ def get_instance_ip(runner_id: int, instance_id: str):
                 logger.error(f"Image not found for runner {runner_id}.")
                 return
 
-            cloud_connector = cloud_connector_repository.find_cloud_connector_by_id(image.cloud_connector_id)
+            cloud_connector = cloud_connector_repository.get_cached_cloud_connector(image.cloud_connector_id)
             if not cloud_connector:
                 logger.error(f"Cloud connector not found for image {image.id}.")
                 return
@@ -175,7 +175,7 @@ def wait_for_ssh(runner_id: int, instance_id: str, public_ip: str):
                 logger.error(f"Image not found for runner {runner_id}.")
                 return
 
-            cloud_connector = cloud_connector_repository.find_cloud_connector_by_id(image.cloud_connector_id)
+            cloud_connector = cloud_connector_repository.get_cached_cloud_connector(image.cloud_connector_id)
             if not cloud_connector:
                 logger.error(f"Cloud connector not found for image {image.id}.")
                 return
@@ -0,0 +1,43 @@
+"""Shared event loop for running coroutines from synchronous Celery task code."""
+# app/util/async_loop.py
+from functools import lru_cache
+from celery.signals import worker_process_shutdown
+import asyncio
+
+@lru_cache(maxsize=1)
+def _get_pool_loop() -> asyncio.AbstractEventLoop:
+    """
+    Return the event loop kept for the Celery tasks' coroutines.
+
+    Created on first use so it belongs to the worker process rather than being inherited from
+    the parent across a fork.
+    """
+    return asyncio.new_event_loop()
+
+def run_pool_coroutine(coro):
+    """
+    Run a coroutine to completion on the process's cached event loop and return its result.
+
+    Unlike asyncio.run, the loop is reused across runs instead of being created and closed each
+    time. Must be called from synchronous task code: a thread whose loop is already running
+    cannot block on another one, so that raises RuntimeError.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        if _get_pool_loop().is_closed():
+            _get_pool_loop.cache_clear()
+        return _get_pool_loop().run_until_complete(coro)
+
+    coro.close()
+    raise RuntimeError("run_pool_coroutine cannot be called while an event loop is running, await the coroutine instead")
+
+@worker_process_shutdown.connect
+def close_pool_loop(**_):
+    """Close the cached event loop when the worker process shuts down."""
+    if _get_pool_loop.cache_info().currsize == 0:
+        return
+    loop = _get_pool_loop()
+    if not loop.is_closed():
+        loop.run_until_complete(loop.shutdown_asyncgens())
+        loop.close()
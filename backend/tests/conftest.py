@@ -0,0 +1,38 @@
+"""
+Shared test setup for the backend.
+
+The app reads its settings from the environment and builds its engine when first imported, so
+the test settings are applied here, before any test module imports app. The engine points at a
+throwaway SQLite file, and the MySQL driver's connect_args are dropped for it.
+"""
+import os
+import tempfile
+import pytest
+import sqlmodel
+
+TEST_DATABASE_PATH = os.path.join(tempfile.mkdtemp(prefix="cloud-ide-tests-"), "test.db")
+
+os.environ["DATABASE_URL"] = f"sqlite:///{TEST_DATABASE_PATH}"
+os.environ["WORKOS_API_KEY"] = "test"
+os.environ["WORKOS_CLIENT_ID"] = "test"
+os.environ["ENCRYPTION_KEY"] = "0123456789abcdef0123"
+
+_create_engine = sqlmodel.create_engine
+
+def _create_test_engine(url, **kwargs):
+    """Create the engine without the MySQL driver's connect_args, which SQLite rejects."""
+    kwargs.pop("connect_args", None)
+    return _create_engine(url, **kwargs)
+
+sqlmodel.create_engine = _create_test_engine
+
+@pytest.fixture
+def db_engine():
+    """Create every table for a test and drop them again afterwards."""
+    import app.models  # noqa: PLC0415 - registers the tables on the metadata
+    from app.models import workos_session  # noqa: PLC0415
+    from app.db.database import engine  # noqa: PLC0415
+
+    sqlmodel.SQLModel.metadata.create_all(engine)
+    yield engine
+    sqlmodel.SQLModel.metadata.drop_all(engine)
@@ -0,0 +1,97 @@
+"""Tests for finding workos sessions by the digest of their access token."""
+import importlib.util
+from pathlib import Path
+import pytest
+import sqlalchemy as sa
+from alembic.migration import MigrationContext
+from alembic.operations import Operations
+from app.business.encryption import digest_text, encrypt_text
+from app.exceptions.authentication_exceptions import NoRefreshSessionFound
+from app.models.workos_session import (WorkosSession, create_workos_session, get_refresh_token,
+                                       get_refresh_token_by_digest, refresh_session_by_digest)
+
+MIGRATION_PATH = Path(__file__).parents[1] / "alembic" / "versions" / "9c4f2e7a1b35_add_workos_session_access_token_lookup.py"
+
+def load_migration():
+    """Import the access token lookup migration module from its file."""
+    spec = importlib.util.spec_from_file_location("access_token_lookup_migration", MIGRATION_PATH)
+    migration = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(migration)
+    return migration
+
+def new_session(session_id: str, access_token: str, refresh_token: str) -> WorkosSession:
+    """Build a workos session holding the given tokens."""
+    workos_session = WorkosSession(session_id=session_id, expiration=0, ip_address="127.0.0.1", user_agent="pytest")
+    workos_session.set_decrypted_access_token(access_token)
+    workos_session.set_decrypted_refresh_token(refresh_token)
+    return workos_session
+
+def test_refresh_token_is_found_by_access_token_digest(db_engine):
+    """A session is looked up by the digest of its access token, not the ciphertext."""
+    create_workos_session(new_session("session-1", "access-1", "refresh-1"))
+    create_workos_session(new_session("session-2", "access-2", "refresh-2"))
+
+    assert get_refresh_token_by_digest(digest_text("access-2")) == "refresh-2"
+    assert get_refresh_token("access-1") == "refresh-1"
+    with pytest.raises(Exception, match="Session not found"):
+        get_refresh_token_by_digest(digest_text("unknown"))
+
+def test_refresh_rotates_the_access_token_digest(db_engine):
+    """After a refresh the session is found by the new token only."""
+    create_workos_session(new_session("session-1", "access-1", "refresh-1"))
+
+    refresh_session_by_digest(digest_text("access-1"), "access-2", "refresh-2")
+
+    assert get_refresh_token_by_digest(digest_text("access-2")) == "refresh-2"
+    with pytest.raises(Exception, match="Session not found"):
+        get_refresh_token_by_digest(digest_text("access-1"))
+    with pytest.raises(NoRefreshSessionFound):
+        refresh_session_by_digest(digest_text("access-1"), "access-3", "refresh-3")
+
+@pytest.fixture
+def pre_migration_engine(tmp_path):
+    """Return an engine holding the workos_session table as it was before the migration."""
+    engine = sa.create_engine(f"sqlite:///{tmp_path / 'migration.db'}")
+    workos_session = sa.Table("workos_session", sa.MetaData(),
+                              sa.Column("session_id", sa.String(64), primary_key=True),
+                              sa.Column("access_token", sa.Text))
+    workos_session.create(engine)
+    with engine.begin() as connection:
+        connection.execute(workos_session.insert(), [
+            {"session_id": "with-token-1", "access_token": encrypt_text("access-1")},
+            {"session_id": "with-token-2", "access_token": encrypt_text("access-2")},
+            {"session_id": "without-token-1", "access_token": ""},
+            {"session_id": "without-token-2", "access_token": ""},
+        ])
+    yield engine
+    engine.dispose()
+
+def run_upgrade(engine):
+    """Run the migration's upgrade against the engine."""
+    migration = load_migration()
+    with engine.begin() as connection, Operations.context(MigrationContext.configure(connection)):
+        migration.upgrade()
+
+def test_migration_backfills_the_access_token_digest(pre_migration_engine):
+    """Stored tokens get the digest the app computes, and sessions without a token stay NULL."""
+    run_upgrade(pre_migration_engine)
+
+    with pre_migration_engine.connect() as connection:
+        lookups = dict(connection.execute(sa.text("SELECT session_id, access_token_lookup FROM workos_session")).all())
+    assert lookups == {
+        "with-token-1": digest_text("access-1"),
+        "with-token-2": digest_text("access-2"),
+        "without-token-1": None,
+        "without-token-2": None,
+    }
+    indexes = sa.inspect(pre_migration_engine).get_indexes("workos_session")
+    assert [(index["name"], index["column_names"], bool(index["unique"])) for index in indexes] == [
+        ("ix_workos_session_access_token_lookup", ["access_token_lookup"], True)
+    ]
+
+def test_migration_requires_the_encryption_key_to_backfill(pre_migration_engine, monkeypatch):
+    """Stored tokens can't be digested without the app's key, so the upgrade refuses to run."""
+    monkeypatch.delenv("ENCRYPTION_KEY")
+
+    with pytest.raises(ValueError, match="ENCRYPTION_KEY"):
+        run_upgrade(pre_migration_engine)
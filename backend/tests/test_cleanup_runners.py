@@ -0,0 +1,112 @@
+"""Tests for the expired runner cleanup task."""
+import asyncio
+from datetime import datetime, timedelta, timezone
+import pytest
+from sqlmodel import Session, select
+from app.business import runner_management
+from app.models import CloudConnector, Image, Runner, RunnerHistory
+from app.tasks import cleanup_runners
+
+TERMINATE_CONCURRENCY = 2
+FAILING_RUNNER_ID = 3
+
+@pytest.fixture
+def image_id(db_engine) -> int:
+    """Insert an image with a cloud connector and return the image id."""
+    with Session(db_engine) as session:
+        cloud_connector = CloudConnector(provider="aws", region="us-east-1", encrypted_access_key="x", encrypted_secret_key="y")
+        session.add(cloud_connector)
+        session.commit()
+        image = Image(name="image", description="image", identifier="ami-test", runner_pool_size=0, machine_id=1,
+                      cloud_connector_id=cloud_connector.id)
+        session.add(image)
+        session.commit()
+        return image.id
+
+def add_runners(engine, image_id: int, states: list[str], session_end: datetime) -> list[int]:
+    """Insert one runner per state and return their ids."""
+    with Session(engine) as session:
+        runners = [
+            Runner(machine_id=1, image_id=image_id, state=state, url="url", identifier=f"i-{index}",
+                   external_hash="hash", env_data={}, session_end=session_end)
+            for index, state in enumerate(states)
+        ]
+        session.add_all(runners)
+        session.commit()
+        return [runner.id for runner in runners]
+
+def test_cleanup_walks_expired_runners_in_keyset_batches(db_engine, image_id, monkeypatch):
+    """Every expired runner is processed once, in id order, in batches of CLEANUP_BATCH_SIZE."""
+    now = datetime.now(timezone.utc)
+    expired_ids = add_runners(db_engine, image_id, ["active"] * 5, now - timedelta(minutes=5))
+    add_runners(db_engine, image_id, ["active"], now + timedelta(minutes=5))
+    add_runners(db_engine, image_id, ["ready", "closed_pool", "terminated"], now - timedelta(minutes=5))
+
+    terminated = []
+
+    async def terminate_runner(runner_id: int, initiated_by: str):
+        terminated.append(runner_id)
+        return {"status": "success"}
+
+    batches = []
+    cleanup_runner_batch = cleanup_runners.cleanup_runner_batch
+
+    def record_batch(session, results, now, cleanup_run_id):
+        batches.append([runner.id for runner in results])
+        return cleanup_runner_batch(session, results, now, cleanup_run_id)
+
+    monkeypatch.setattr(cleanup_runners, "CLEANUP_BATCH_SIZE", 2)
+    monkeypatch.setattr(cleanup_runners, "cleanup_runner_batch", record_batch)
+    monkeypatch.setattr(runner_management, "terminate_runner", terminate_runner)
+
+    summary = cleanup_runners.cleanup_active_runners.run()
+
+    assert batches == [expired_ids[0:2], expired_ids[2:4], expired_ids[4:5]]
+    assert sorted(terminated) == expired_ids
+    assert (summary["found_expired"], summary["successful_terminations"], summary["failed_terminations"]) == (5, 5, 0)
+    with Session(db_engine) as session:
+        expiry_runner_ids = session.exec(select(RunnerHistory.runner_id).where(RunnerHistory.event_name == "runner_expired")).all()
+    assert sorted(expiry_runner_ids) == expired_ids
+
+def test_failed_terminations_move_runners_to_error(db_engine, image_id, monkeypatch):
+    """A runner whose termination raises is moved to the error state, the others are not."""
+    now = datetime.now(timezone.utc)
+    failing_id, succeeding_id = add_runners(db_engine, image_id, ["active", "active"], now - timedelta(minutes=5))
+
+    async def terminate_runner(runner_id: int, initiated_by: str):
+        if runner_id == failing_id:
+            raise RuntimeError("cloud api unavailable")
+        return {"status": "success"}
+
+    monkeypatch.setattr(runner_management, "terminate_runner", terminate_runner)
+
+    summary = cleanup_runners.cleanup_active_runners.run()
+
+    assert (summary["successful_terminations"], summary["failed_terminations"]) == (1, 1)
+    with Session(db_engine) as session:
+        assert session.get(Runner, failing_id).state == "error"
+        assert session.get(Runner, succeeding_id).state == "active"
+
+def test_terminations_are_bounded_by_the_semaphore(monkeypatch):
+    """No more than CLEANUP_TERMINATE_CONCURRENCY terminations run at once, results keep their order."""
+    running = 0
+    peak = 0
+
+    async def terminate_runner(runner_id: int, initiated_by: str):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        if runner_id == FAILING_RUNNER_ID:
+            raise RuntimeError("failed")
+        return {"status": "success", "runner_id": runner_id}
+
+    monkeypatch.setattr(cleanup_runners, "CLEANUP_TERMINATE_CONCURRENCY", TERMINATE_CONCURRENCY)
+    monkeypatch.setattr(runner_management, "terminate_runner", terminate_runner)
+
+    results = asyncio.run(cleanup_runners.terminate_expired_runners([1, 2, 3, 4, 5, 6], initiated_by="test"))
+
+    assert peak == TERMINATE_CONCURRENCY
+    assert [result["runner_id"] for result in results if not isinstance(result, Exception)] == [1, 2, 4, 5, 6]
+    assert isinstance(results[2], RuntimeError)
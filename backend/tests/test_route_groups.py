@@ -0,0 +1,47 @@
+"""Tests for the route guard's route matching."""
+import re
+import pytest
+from app.api.main import (DEV_ROUTES, RUNNER_ACCESS_ROUTES, UNSECURE_ROUTES, RouteGroup, exact_route_paths,
+                          literal_route_prefixes, runner_id_from_path)
+
+PATHS = (
+    "/v1/machine_auth", "/v1/machine_auth/", "/v1/machine_auth/extra", "/v1/machine_authx",
+    "/v1/user_auth/authkit_url/", "/v1/user_auth/authkit_redirect/?state=1", "/v1/user_auth/callback/code",
+    "/v1/user_auth/callback", "/v1/user_auth/logout/",
+    "/v1/runners/12/state", "/v1/runners/12/state/", "/v1/runners/abc/state", "/v1/runners/12/state/extra",
+    "/v1/runners/12", "/v1/runners/12/", "/v1/runners/", "/v1/runners/12/devserver", "/v1/runners/12/extend_session/",
+    "/v1/runners/connect/7", "/v1/runners/connect/x", "/v1/app_requests/runner_status", "/v1/app_requests/with_image/",
+    "/docs", "/docs/", "/docs/oauth2-redirect", "/openapi.json", "/v1/users/", "/", "",
+)
+
+@pytest.mark.parametrize("patterns", [UNSECURE_ROUTES, RUNNER_ACCESS_ROUTES, DEV_ROUTES])
+@pytest.mark.parametrize("path", PATHS)
+def test_route_group_matches_like_its_patterns(patterns, path):
+    """The set lookup and prefix filter give the same answer as matching every pattern."""
+    expected = any(re.match(pattern, path) for pattern in patterns)
+
+    assert RouteGroup(patterns).matches(path) is expected
+
+def test_exact_paths_only_come_from_literal_patterns():
+    """Only fully anchored literal patterns are answered by the set lookup."""
+    assert exact_route_paths(UNSECURE_ROUTES) == {
+        "/v1/machine_auth", "/v1/machine_auth/", "/v1/app_requests/runner_status", "/v1/app_requests/runner_status/",
+    }
+    assert exact_route_paths(DEV_ROUTES) == {"/docs", "/docs/"}
+
+def test_literal_prefixes_stop_before_regex_syntax():
+    """A prefix ends at the first metacharacter, and drops a character a quantifier makes optional."""
+    assert literal_route_prefixes(("/v1/runners/\\d+/state/?$", "/docs/?$", "/v1/user_auth/callback/", "/a.b")) == (
+        "/v1/runners/", "/docs", "/v1/user_auth/callback/", "/a",
+    )
+
+@pytest.mark.parametrize(("path", "runner_id"), [
+    ("/v1/runners/12/state", "12"),
+    ("/v1/runners/12", "12"),
+    ("/v1/runners/connect/7", None),
+    ("/v1/runners/", None),
+    ("/v1/users/12", None),
+])
+def test_runner_id_from_path(path, runner_id):
+    """The runner id is the numeric segment right after the runners prefix."""
+    assert runner_id_from_path(path) == runner_id
@@ -0,0 +1,84 @@
+"""Tests for claiming runners out of the pool and releasing them."""
+from datetime import datetime, timedelta, timezone
+import pytest
+from sqlalchemy import event
+from sqlalchemy.dialects import mysql
+from sqlalchemy.orm import Session as OrmSession
+from sqlmodel import Session
+from app.db import runner_repository
+from app.models import Runner
+
+IMAGE_ID = 1
+
+def add_runner(engine, state: str, created_on: datetime, image_id: int = IMAGE_ID) -> int:
+    """Insert a runner and return its id."""
+    with Session(engine) as session:
+        runner = Runner(machine_id=1, image_id=image_id, state=state, url="url", identifier="i-test",
+                        external_hash="hash", env_data={}, created_on=created_on)
+        session.add(runner)
+        session.commit()
+        return runner.id
+
+def runner_state(engine, runner_id: int) -> str:
+    """Read a runner's state straight from the database."""
+    with Session(engine) as session:
+        return session.get(Runner, runner_id).state
+
+@pytest.fixture
+def now() -> datetime:
+    """Return the current UTC time."""
+    return datetime.now(timezone.utc)
+
+def test_claim_takes_the_oldest_matching_runner(db_engine, now):
+    """The oldest runner in a matching state is claimed first, then the next one."""
+    newer_id = add_runner(db_engine, "ready", now)
+    older_id = add_runner(db_engine, "ready", now - timedelta(minutes=10))
+    add_runner(db_engine, "ready", now - timedelta(minutes=20), image_id=2)
+    add_runner(db_engine, "active", now - timedelta(minutes=30))
+
+    first = runner_repository.find_runner_by_image_id_and_states(IMAGE_ID, ["ready"], "ready_claimed")
+    second = runner_repository.find_runner_by_image_id_and_states(IMAGE_ID, ["ready"], "ready_claimed")
+
+    assert (first.id, second.id) == (older_id, newer_id)
+    assert first.state == "ready_claimed"
+    assert runner_state(db_engine, older_id) == "ready_claimed"
+    assert runner_state(db_engine, newer_id) == "ready_claimed"
+
+def test_claim_returns_none_once_the_pool_is_empty(db_engine, now):
+    """A claimed runner is no longer in a pool state, so it is not claimed twice."""
+    add_runner(db_engine, "ready", now)
+
+    assert runner_repository.find_runner_by_image_id_and_states(IMAGE_ID, ["ready"], "ready_claimed") is not None
+    assert runner_repository.find_runner_by_image_id_and_states(IMAGE_ID, ["ready"], "ready_claimed") is None
+
+def test_claim_locks_the_row_with_skip_locked(db_engine, now):
+    """The claim query reads the row with FOR UPDATE SKIP LOCKED on MySQL."""
+    add_runner(db_engine, "ready", now)
+    statements = []
+
+    def capture(orm_execute_state):
+        statements.append(orm_execute_state.statement)
+
+    event.listen(OrmSession, "do_orm_execute", capture)
+    try:
+        runner_repository.find_runner_by_image_id_and_states(IMAGE_ID, ["ready"], "ready_claimed")
+    finally:
+        event.remove(OrmSession, "do_orm_execute", capture)
+
+    claim_sql = str(statements[0].compile(dialect=mysql.dialect()))
+    assert claim_sql.endswith("FOR UPDATE SKIP LOCKED")
+
+def test_release_returns_a_claimed_runner_to_the_pool(db_engine, now):
+    """Releasing moves the runner back to its pool state exactly once."""
+    runner_id = add_runner(db_engine, "ready_claimed", now)
+
+    assert runner_repository.release_claimed_runner(runner_id, "ready_claimed", "ready") is True
+    assert runner_state(db_engine, runner_id) == "ready"
+    assert runner_repository.release_claimed_runner(runner_id, "ready_claimed", "ready") is False
+
+def test_release_leaves_a_runner_that_moved_on(db_engine, now):
+    """A runner that already left the claimed state is not put back in the pool."""
+    runner_id = add_runner(db_engine, "awaiting_client", now)
+
+    assert runner_repository.release_claimed_runner(runner_id, "ready_claimed", "ready") is False
+    assert runner_state(db_engine, runner_id) == "awaiting_client"
@@ -0,0 +1,43 @@
+"""Tests for the user create schema's email validation."""
+import pytest
+from pydantic import ValidationError
+from app.schemas.user import EMAIL_PATTERN, UserCreate
+
+@pytest.mark.parametrize("email", [
+    "user@example.com",
+    "first.last+tag@sub.example.co.uk",
+    "USER@EXAMPLE.COM",
+    "o'brien@example.io",
+])
+def test_email_pattern_accepts_addresses(email):
+    """Addresses with one @ and a dotted domain match."""
+    assert EMAIL_PATTERN.fullmatch(email)
+
+@pytest.mark.parametrize("email", [
+    "",
+    "user",
+    "user@",
+    "@example.com",
+    "user@example",
+    "user@@example.com",
+    "user@exa mple.com",
+    "us er@example.com",
+    "user@example.",
+    "user@example.com\n",
+])
+def test_email_pattern_rejects_malformed_addresses(email):
+    """Addresses missing a part, with whitespace or a second @ don't match."""
+    assert not EMAIL_PATTERN.fullmatch(email)
+
+def build_user(email: str) -> UserCreate:
+    """Build a UserCreate with the given email."""
+    return UserCreate(first_name="First", last_name="Last", email=email, password="password")
+
+def test_validator_strips_and_lowercases_the_domain():
+    """Surrounding whitespace is dropped and only the domain is lowercased."""
+    assert build_user("  First.Last@Example.COM ").email == "First.Last@example.com"
+
+def test_validator_rejects_malformed_addresses():
+    """A malformed address fails validation with the EmailStr message."""
+    with pytest.raises(ValidationError, match="value is not a valid email address"):
+        build_user("not-an-email")